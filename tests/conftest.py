@@ -33,6 +33,35 @@ assert any(app in INSTALLED_APPS for app in ['posts.apps.PostsConfig', 'posts'])
     'Пожалуйста зарегистрируйте приложение в `settings.INSTALLED_APPS`'
 )
 
+import pytest
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    # Тестовая база в файле, чтобы --reuse-db сохранял её между запусками.
+    # Имя отличается от базы `manage.py test`: pytest не сбрасывает
+    # счётчики id, а тесты posts/tests на них рассчитывают.
+    from django.conf import settings
+    test_settings = settings.DATABASES['default'].setdefault('TEST', {})
+    if not test_settings.get('NAME'):
+        test_settings['NAME'] = os.path.join(MANAGE_PATH, 'test_pytest.sqlite3')
+
+
+@pytest.fixture(autouse=True)
+def flush_views_immediately(settings):
+    # Буфер просмотров не должен дожить до выхода, когда тестовой базы
+    # уже нет: см. posts/view_counter.py.
+    settings.VIEW_COUNT_FLUSH_INTERVAL = 0
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Фикстуры создают посты через bulk_create, без сигналов, которые
+    # сбрасывают кешированные ленты и сводки профилей.
+    from django.core.cache import cache
+    cache.clear()
+
+
 pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
@@ -27,7 +27,10 @@ def post_with_group(user, group):
 
 
 @pytest.fixture
-def few_posts_with_group(mixer, user, group):
+def few_posts_with_group(user, group):
     """Return one record with the same author and group."""
-    posts = mixer.cycle(20).blend(Post, author=user, group=group)
+    posts = Post.objects.bulk_create(
+        Post(text=f'Тестовый пост {i}', author=user, group=group)
+        for i in range(20)
+    )
     return posts[0]
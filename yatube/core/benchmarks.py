@@ -0,0 +1,321 @@
+"""Набор замеров производительности для команды `manage.py benchmark`."""
+import time
+
+SUITES = {}
+
+
+def suite(name):
+    """Регистрирует функцию замера под именем `name`."""
+    def decorator(func):
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+def measure(func, repeat):
+    """Возвращает среднее время одного вызова `func` в миллисекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+@suite('hashers')
+def hashers(repeat):
+    """Время хеширования и проверки пароля каждым доступным хешером."""
+    from django.contrib.auth.hashers import get_hashers
+
+    password = 'correct horse battery staple'
+    results = []
+    for hasher in get_hashers():
+        try:
+            encoded = hasher.encode(password, hasher.salt())
+        except ValueError:
+            # Библиотека для argon2/bcrypt не установлена.
+            continue
+        results.append((
+            f'{hasher.algorithm} verify',
+            measure(lambda: hasher.verify(password, encoded), repeat),
+        ))
+    return results
+
+
+def feed_urls():
+    """Адреса лент для замеров, построенные по данным текущей базы."""
+    from posts.models import Group, Post
+
+    urls = ['/']
+    group = Group.objects.first()
+    if group is not None:
+        urls.append(f'/group/{group.slug}/')
+    post = Post.objects.select_related('author').first()
+    if post is not None:
+        urls.append(f'/profile/{post.author.username}/')
+        urls.append(f'/posts/{post.pk}/')
+    return urls
+
+
+def measure_urls(urls, repeat):
+    from django.test import Client
+
+    client = Client()
+    return [
+        (f'GET {url}', measure(lambda: client.get(url), repeat))
+        for url in urls
+    ]
+
+
+@suite('feeds')
+def feeds(repeat):
+    """Время ответа страниц ленты на данных текущей базы."""
+    return measure_urls(feed_urls(), repeat)
+
+
+@suite('archive')
+def archive(repeat):
+    """Время ответа лент до и после архивации старых постов.
+
+    Архивация выполняется внутри транзакции, которая затем откатывается,
+    поэтому данные в базе не меняются.
+    """
+    from django.conf import settings
+    from django.db import transaction
+
+    from posts.archive import archive_posts
+
+    urls = feed_urls()
+    results = [
+        (f'{label} (без архива)', ms)
+        for label, ms in measure_urls(urls, repeat)
+    ]
+    with transaction.atomic():
+        archive_posts(
+            settings.POSTS_ARCHIVE_AFTER_DAYS,
+            settings.POSTS_ARCHIVE_BATCH_SIZE,
+        )
+        results += [
+            (f'{label} (с архивом)', ms)
+            for label, ms in measure_urls(urls, repeat)
+        ]
+        transaction.set_rollback(True)
+    return results
+
+
+def wait_for_port(port, timeout=30):
+    import socket
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Сервер на порту {port} не запустился')
+
+
+def measure_concurrent(func, repeat, clients):
+    """Среднее время на вызов при `clients` параллельных клиентах, в мс."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(lambda _: func(), range(repeat * clients)))
+    return (time.perf_counter() - start) / (repeat * clients) * 1000
+
+
+@suite('serve')
+def serve(repeat):
+    """Пропускная способность `manage.py serve` в разных конфигурациях.
+
+    Для каждой конфигурации сервер запускается отдельным процессом на
+    текущей базе, а 8 клиентов параллельно запрашивают ленты. Время —
+    длительность замера, делённая на число запросов.
+    """
+    import os
+    import socket
+    import subprocess
+    import sys
+    from urllib.request import urlopen
+
+    from django.conf import settings
+
+    from core.server import default_workers
+
+    configs = [
+        (1, 1),
+        (1, 4),
+        (default_workers(), settings.SERVE_THREADS),
+    ]
+    urls = feed_urls()
+    results = []
+    for workers, threads in configs:
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join(settings.BASE_DIR, 'manage.py'),
+                'serve',
+                '--bind', f'127.0.0.1:{port}',
+                '--workers', str(workers),
+                '--threads', str(threads),
+                '--max-requests', '0',
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port)
+            for url in urls:
+                address = f'http://127.0.0.1:{port}{url}'
+                urlopen(address).read()
+                ms = measure_concurrent(
+                    lambda: urlopen(address).read(), repeat, clients=8
+                )
+                results.append((f'{workers}x{threads} GET {url}', ms))
+        finally:
+            process.terminate()
+            process.wait()
+    return results
+
+
+@suite('follow')
+def follow(repeat):
+    """Первая страница ленты подписок при 10 000 подписок.
+
+    Сравнивает выборку `author__in` по подпискам с заранее собранной
+    лентой (TimelineEntry). Авторы, посты и подписки создаются внутри
+    транзакции, которая затем откатывается.
+    """
+    from datetime import timedelta
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.test import Client
+    from django.utils import timezone
+
+    from posts.models import Follow, Post, TimelineEntry
+    from posts.timeline import Timeline
+
+    User = get_user_model()
+    follows, posts_per_author = 10000, 3
+    size = settings.POSTS_ON_PAGE
+    with transaction.atomic():
+        reader = User.objects.create(username='benchmark-follow-reader')
+        User.objects.bulk_create(
+            User(username=f'benchmark-follow-{i}') for i in range(follows)
+        )
+        authors = list(
+            User.objects.filter(username__startswith='benchmark-follow-')
+            .exclude(pk=reader.pk).values_list('pk', flat=True)
+        )
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    author_id=author_id,
+                    text=f'Пост {n}',
+                    pub_date=now - timedelta(minutes=i * posts_per_author + n),
+                )
+                for i, author_id in enumerate(authors)
+                for n in range(posts_per_author)
+            ),
+        )
+        Follow.objects.bulk_create(
+            Follow(user=reader, author_id=author_id) for author_id in authors
+        )
+        followed = Follow.objects.filter(user=reader).values('author_id')
+        TimelineEntry.objects.bulk_create(
+            (
+                TimelineEntry(
+                    user=reader,
+                    author_id=post.author_id,
+                    post_id=post.pk,
+                    pub_date=post.pub_date,
+                )
+                for post in Post.objects.filter(author__in=followed)
+                .only('author_id', 'pub_date').iterator()
+            ),
+        )
+        by_authors = Post.objects.filter(author__in=followed)
+        client = Client()
+        client.force_login(reader)
+        results = [
+            ('author__in: страница', measure(
+                lambda: list(by_authors[:size]), repeat
+            )),
+            ('author__in: count', measure(by_authors.count, repeat)),
+            ('timeline: страница', measure(
+                lambda: Timeline(reader)[:size], repeat
+            )),
+            ('timeline: count', measure(Timeline(reader).count, repeat)),
+            ('GET /follow/', measure(lambda: client.get('/follow/'), repeat)),
+        ]
+        transaction.set_rollback(True)
+    return results
+
+
+@suite('context')
+def context(repeat):
+    """Цена контекст-процессоров и цепочки middleware на анонимном GET.
+
+    Процессоры замеряются по 1000 вызовов на анонимном запросе. Страница
+    /about/author/ почти не обращается к базе, поэтому разница между
+    наборами процессоров и между полной и пустой цепочкой middleware
+    видна без шума от запросов.
+    """
+    from datetime import datetime
+
+    from django.conf import settings
+    from django.contrib.auth.models import AnonymousUser
+    from django.template import engines
+    from django.test import Client, RequestFactory, override_settings
+    from django.utils.functional import SimpleLazyObject
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+
+    def thousand(func):
+        return lambda: [func(request) for _ in range(1000)]
+
+    results = []
+    for processor in engines['django'].engine.template_context_processors:
+        name = f'{processor.__module__}.{processor.__name__}'
+        results.append((f'{name} x1000', measure(thousand(processor), repeat)))
+    results.append((
+        'year через SimpleLazyObject x1000',
+        measure(
+            thousand(lambda request: {
+                'year': SimpleLazyObject(lambda: datetime.now().year)
+            }),
+            repeat,
+        ),
+    ))
+
+    def page(label, **overrides):
+        with override_settings(**overrides):
+            client = Client()
+            client.get('/about/author/')
+            results.append((
+                f'GET /about/author/ {label}',
+                measure(lambda: client.get('/about/author/'), repeat),
+            ))
+
+    template = settings.TEMPLATES[0]
+    lean_processors = {
+        **template,
+        'OPTIONS': {
+            **template['OPTIONS'],
+            'context_processors': [
+                processor
+                for processor in template['OPTIONS']['context_processors']
+                if processor != 'django.template.context_processors.debug'
+            ],
+        },
+    }
+    page('(все процессоры)')
+    page('(без debug)', TEMPLATES=[lean_processors])
+    page('(без middleware)', MIDDLEWARE=[])
+    return results
@@ -0,0 +1,139 @@
+"""Проверки производительности для `manage.py check --deploy`.
+
+Все проверки помечены тегом `performance`, поэтому их можно запустить
+отдельно: `manage.py check --deploy --tag performance`.
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PERFORMANCE = 'performance'
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(PERFORMANCE, deploy=True)
+def check_query_logging(app_configs, **kwargs):
+    """В рабочем окружении запросы к базе не должны копиться в памяти."""
+    if settings.DEBUG:
+        return [
+            Warning(
+                'DEBUG включён: каждый SQL-запрос сохраняется в '
+                'connection.queries, и память воркера растёт.',
+                hint='Выключите DEBUG в рабочих настройках.',
+                id='core.W001',
+            )
+        ]
+    return []
+
+
+@register(PERFORMANCE, deploy=True)
+def check_template_loaders(app_configs, **kwargs):
+    errors = []
+    for template in settings.TEMPLATES:
+        loaders = template.get('OPTIONS', {}).get('loaders')
+        # Без явных loaders Django сам включает кеширующий загрузчик,
+        # когда DEBUG выключен.
+        if loaders is None and not settings.DEBUG:
+            continue
+        names = [
+            loader[0] if isinstance(loader, (list, tuple)) else loader
+            for loader in loaders or []
+        ]
+        if 'django.template.loaders.cached.Loader' not in names:
+            errors.append(Warning(
+                'Шаблоны разбираются заново на каждый рендер.',
+                hint='Оберните загрузчики в '
+                     'django.template.loaders.cached.Loader.',
+                id='core.W002',
+            ))
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_persistent_connections(app_configs, **kwargs):
+    return [
+        Warning(
+            f'База {alias!r} открывает новое соединение на каждый запрос.',
+            hint='Задайте CONN_MAX_AGE больше нуля.',
+            id='core.W003',
+        )
+        for alias, database in settings.DATABASES.items()
+        if not database.get('CONN_MAX_AGE')
+    ]
+
+
+@register(PERFORMANCE, deploy=True)
+def check_cache_backend(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in PER_PROCESS_CACHES:
+        return [
+            Warning(
+                f'Кеш {backend} свой у каждого процесса: воркеры не видят '
+                'сбросов кеша друг друга и прогревают его по отдельности.',
+                hint='Используйте memcached или файловый кеш.',
+                id='core.W004',
+            )
+        ]
+    return []
+
+
+@register(PERFORMANCE, deploy=True)
+def check_session_engine(app_configs, **kwargs):
+    if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.db':
+        return [
+            Warning(
+                'Сессия читается из базы на каждый запрос.',
+                hint="Используйте 'django.contrib.sessions.backends."
+                     "cached_db'.",
+                id='core.W005',
+            )
+        ]
+    return []
+
+
+@register(PERFORMANCE, deploy=True)
+def check_static_storage(app_configs, **kwargs):
+    if 'Manifest' not in settings.STATICFILES_STORAGE:
+        return [
+            Warning(
+                'У статических файлов нет хеша в имени, поэтому их нельзя '
+                'кешировать в браузере надолго.',
+                hint='Используйте ManifestStaticFilesStorage.',
+                id='core.W006',
+            )
+        ]
+    return []
+
+
+@register(PERFORMANCE, deploy=True)
+def check_compression(app_configs, **kwargs):
+    if 'django.middleware.gzip.GZipMiddleware' not in settings.MIDDLEWARE:
+        return [
+            Warning(
+                'Ответы отдаются без сжатия.',
+                hint='Добавьте django.middleware.gzip.GZipMiddleware или '
+                     'включите сжатие на прокси.',
+                id='core.W007',
+            )
+        ]
+    return []
+
+
+@register(PERFORMANCE, deploy=True)
+def check_ratelimit_cache(app_configs, **kwargs):
+    if not settings.RATELIMIT_POLICIES:
+        return []
+    backend = settings.CACHES[settings.RATELIMIT_CACHE]['BACKEND']
+    if backend in PER_PROCESS_CACHES or backend.endswith('FileBasedCache'):
+        return [
+            Warning(
+                f'Счётчики ограничения частоты в кеше {backend} неточны: '
+                'каждый воркер считает запросы сам или incr не атомарен.',
+                hint='Укажите в RATELIMIT_CACHE кеш memcached.',
+                id='core.W008',
+            )
+        ]
+    return []
@@ -1,9 +1,16 @@
 from datetime import datetime
 
 
-def year(request) -> int:
-    """Добавляет переменную с текущим годом."""
-    cur_year = datetime.now().year
+def current_year():
+    return datetime.now().year
+
+
+def year(request):
+    """Добавляет переменную с текущим годом.
+
+    В контекст кладётся сама функция: шаблон вызовет её, только если
+    выводит `year`. SimpleLazyObject здесь дороже самого datetime.now().
+    """
     return {
-        'year': cur_year,
+        'year': current_year,
     }
@@ -0,0 +1,66 @@
+"""Замер времени контекст-процессоров по запросам.
+
+При CONTEXT_PROCESSOR_PROFILING контекст-процессоры шаблонного движка
+оборачиваются замером, время копится в запросе, а
+ContextProcessorTimingMiddleware отдаёт его в заголовке Server-Timing
+(виден во вкладке Network браузера). Ленивые значения (`user`, `year`)
+замер видит только в момент создания: их настоящая цена попадает во
+время рендера шаблона.
+"""
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+
+def processor_name(processor):
+    return f'{processor.__module__}.{processor.__name__}'
+
+
+def timed(processor):
+    name = processor_name(processor)
+
+    @wraps(processor)
+    def wrapper(request):
+        start = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            timings = request.__dict__.setdefault(
+                'context_processor_timings', defaultdict(float)
+            )
+            timings[name] += time.perf_counter() - start
+
+    wrapper.timed = True
+    return wrapper
+
+
+def instrument_engines():
+    """Оборачивает контекст-процессоры всех движков DjangoTemplates."""
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        processors = engine.template_context_processors
+        if all(getattr(processor, 'timed', False) for processor in processors):
+            continue
+        # template_context_processors — cached_property, поэтому обёртки
+        # достаточно положить в __dict__ движка.
+        engine.__dict__['template_context_processors'] = tuple(
+            processor if getattr(processor, 'timed', False)
+            else timed(processor)
+            for processor in processors
+        )
+
+
+def server_timing(timings):
+    """Значение заголовка Server-Timing, длительности в миллисекундах."""
+    entries = [
+        f'cp;desc="{name}";dur={seconds * 1000:.3f}'
+        for name, seconds in sorted(timings.items())
+    ]
+    total = sum(timings.values()) * 1000
+    entries.append(f'cp-total;dur={total:.3f}')
+    return ', '.join(entries)
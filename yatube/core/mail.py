@@ -0,0 +1,152 @@
+"""Очередь исходящих писем.
+
+OutboxBackend вместо отправки кладёт письма в таблицу OutboxMessage, и
+запрос (например, сброс пароля) не ждёт почтовый сервер. Команда
+`manage.py send_outbox` забирает письма пачками и отправляет их через
+одно SMTP-соединение, соблюдая EMAIL_OUTBOX_RATE писем в секунду.
+Неудачная отправка повторяется с растущей паузой, пока не кончатся
+EMAIL_OUTBOX_MAX_ATTEMPTS попыток.
+"""
+import smtplib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+# Столько секунд взятое воркером письмо не достанется другому воркеру.
+LEASE_SECONDS = 300
+
+STATUS_FIELDS = ['attempts', 'next_attempt', 'sent', 'last_error']
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который только ставит письма в очередь."""
+
+    def send_messages(self, email_messages):
+        rows = [
+            OutboxMessage(
+                from_email=message.from_email,
+                recipients='\n'.join(message.recipients()),
+                message=message.message().as_bytes(linesep='\r\n'),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(rows)
+        return len(rows)
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_batch(batch_size):
+    """Забирает пачку писем, которые пора отправить.
+
+    Письма помечаются арендой (next_attempt в будущем) одним UPDATE,
+    поэтому несколько воркеров не отправят одно письмо дважды.
+    """
+    now = timezone.now()
+    ids = list(
+        OutboxMessage.objects.filter(
+            sent__isnull=True,
+            next_attempt__lte=now,
+            attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        )
+        .order_by('next_attempt')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    lease = now + timedelta(seconds=LEASE_SECONDS)
+    OutboxMessage.objects.filter(pk__in=ids, next_attempt__lte=now).update(
+        next_attempt=lease
+    )
+    return list(
+        OutboxMessage.objects.filter(pk__in=ids, next_attempt=lease)
+        .order_by('pk')
+    )
+
+
+class OutboxSender:
+    """Отправляет письма из очереди через одно открытое SMTP-соединение."""
+
+    def __init__(self, rate=None, batch_size=None):
+        self.rate = rate or settings.EMAIL_OUTBOX_RATE
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.backend = get_connection(settings.EMAIL_OUTBOX_BACKEND)
+        self.last_send = 0
+
+    def close(self):
+        self.backend.close()
+
+    def throttle(self):
+        pause = 1 / self.rate - (time.monotonic() - self.last_send)
+        if pause > 0:
+            time.sleep(pause)
+        self.last_send = time.monotonic()
+
+    def deliver(self, row):
+        self.throttle()
+        if self.backend.connection is None:
+            self.backend.open()
+        try:
+            self.backend.connection.sendmail(
+                row.from_email, row.recipient_list, row.message
+            )
+        except smtplib.SMTPServerDisconnected:
+            # Сервер закрыл простаивающее соединение: одна повторная
+            # попытка через новое.
+            self.backend.close()
+            self.backend.open()
+            self.backend.connection.sendmail(
+                row.from_email, row.recipient_list, row.message
+            )
+
+    def send_batch(self):
+        """Отправляет одну пачку, возвращает число взятых писем.
+
+        Итог каждого письма сохраняется сразу после попытки: если воркер
+        упадёт посреди пачки, отправленные письма не вернутся в очередь
+        по истечении аренды.
+        """
+        rows = claim_batch(self.batch_size)
+        for row in rows:
+            row.attempts += 1
+            try:
+                self.deliver(row)
+            except smtplib.SMTPRecipientsRefused as error:
+                # Адрес отвергнут окончательно: повторять бессмысленно.
+                row.attempts = settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+                row.last_error = str(error)
+            except (smtplib.SMTPException, OSError) as error:
+                row.next_attempt = timezone.now() + retry_delay(row.attempts)
+                row.last_error = str(error)
+                self.backend.close()
+            except Exception as error:
+                # Неожиданная ошибка (например, кодировки) засчитывается
+                # как попытка, а воркер падает с исходной ошибкой.
+                row.next_attempt = timezone.now() + retry_delay(row.attempts)
+                row.last_error = repr(error)
+                row.save(update_fields=STATUS_FIELDS)
+                self.backend.close()
+                raise
+            else:
+                row.sent = timezone.now()
+                row.last_error = ''
+            row.save(update_fields=STATUS_FIELDS)
+        return len(rows)
+
+    def send_pending(self):
+        """Отправляет всё, что пора отправить, возвращает число писем."""
+        total = 0
+        while True:
+            claimed = self.send_batch()
+            if not claimed:
+                return total
+            total += claimed
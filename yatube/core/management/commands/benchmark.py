@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import SUITES
+
+
+class Command(BaseCommand):
+    help = 'Запускает замеры производительности и печатает время в мс.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'suites', nargs='*',
+            help=f'Наборы замеров: {", ".join(sorted(SUITES))}.',
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        names = options['suites'] or sorted(SUITES)
+        unknown = set(names) - set(SUITES)
+        if unknown:
+            raise CommandError(f'Неизвестные наборы: {", ".join(unknown)}')
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for label, ms in SUITES[name](options['repeat']):
+                self.stdout.write(f'  {label:<40} {ms:10.3f} ms')
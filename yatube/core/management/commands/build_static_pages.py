@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.prebuilt import build_pages
+
+
+class Command(BaseCommand):
+    help = 'Заранее рендерит неизменяемые страницы из PREBUILT_PAGES.'
+
+    def handle(self, *args, **options):
+        manifest = build_pages(
+            settings.PREBUILT_PAGES, settings.PREBUILT_PAGES_DIR
+        )
+        for path, entry in manifest.items():
+            self.stdout.write(f'{path} -> {entry["file"]} {entry["etag"]}')
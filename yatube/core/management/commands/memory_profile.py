@@ -0,0 +1,44 @@
+import gc
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core.memory import take_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Запрашивает страницу много раз в этом процессе и показывает, '
+        'какие строки кода накапливают память между запросами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--frames', type=int, default=1)
+
+    def handle(self, *args, **options):
+        client = Client()
+        url = options['url']
+        # Прогрев заполняет кеши шаблонов, URL и запросов: их рост не утечка.
+        for _ in range(options['warmup']):
+            client.get(url)
+        tracemalloc.start(options['frames'])
+        gc.collect()
+        before = take_snapshot()
+        for _ in range(options['requests']):
+            client.get(url)
+        gc.collect()
+        after = take_snapshot()
+        tracemalloc.stop()
+        stats = after.compare_to(before, 'lineno')
+        growth = sum(stat.size_diff for stat in stats)
+        self.stdout.write(
+            f'{url}: {growth / options["requests"]:.0f} Б на запрос '
+            f'после {options["requests"]} запросов'
+        )
+        for stat in stats[:options['top']]:
+            self.stdout.write(f'  {stat}')
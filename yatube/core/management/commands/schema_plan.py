@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from core.schema_changes import CHEAP, REBUILDS_TABLE, operation_cost
+
+
+class Command(BaseCommand):
+    help = ('Показывает непримененные миграции и отмечает операции, '
+            'которые пересобирают таблицу и блокируют сайт.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        executor = MigrationExecutor(connection)
+        targets = executor.loader.graph.leaf_nodes()
+        plan = executor.migration_plan(targets)
+        if not plan:
+            self.stdout.write('Все миграции применены.')
+            return
+        blocking = 0
+        # Таблицы, созданные этим же планом, ещё пусты: их пересборка
+        # ничего не блокирует.
+        new_tables = set()
+        for migration, backwards in plan:
+            self.stdout.write(self.style.MIGRATE_HEADING(str(migration)))
+            for operation in migration.operations:
+                model = (
+                    migration.app_label,
+                    getattr(operation, 'model_name_lower', None)
+                    or getattr(operation, 'name_lower', None),
+                )
+                if operation.__class__.__name__ == 'CreateModel':
+                    new_tables.add(model)
+                cost = operation_cost(operation)
+                if model in new_tables and cost == REBUILDS_TABLE:
+                    cost = CHEAP
+                line = f'  {operation.describe()} — {cost}'
+                if cost == REBUILDS_TABLE and connection.vendor == 'sqlite':
+                    blocking += 1
+                    line = self.style.WARNING(line)
+                self.stdout.write(line)
+        if blocking:
+            self.stdout.write(self.style.WARNING(
+                f'Операций с пересборкой таблицы: {blocking}. Разбейте их на '
+                'создание новой таблицы, copy_table_in_chunks и '
+                'переименование или на backfill в миграции с atomic = False.'
+            ))
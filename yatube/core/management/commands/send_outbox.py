@@ -0,0 +1,51 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.mail import OutboxSender
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutboxMessage. Без --once работает '
+        'постоянно и проверяет очередь каждые --interval секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true')
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--rate', type=float, default=settings.EMAIL_OUTBOX_RATE,
+            help='Не больше стольких писем в секунду.',
+        )
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        sender = OutboxSender(
+            rate=options['rate'], batch_size=options['batch_size']
+        )
+        try:
+            while self.running:
+                sent = sender.send_pending()
+                if sent:
+                    self.stdout.write(f'Обработано писем: {sent}')
+                if options['once']:
+                    break
+                # Соединение не держится открытым, пока очередь пуста.
+                sender.close()
+                time.sleep(options['interval'])
+        finally:
+            sender.close()
+
+    def stop(self, signum, frame):
+        self.running = False
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+from core.server import PreforkServer
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает предфорковый WSGI-сервер: приложение загружается до '
+        'форка, воркеры перезапускаются по числу запросов и памяти.'
+    )
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bind', default='127.0.0.1:8000',
+            help='Адрес в виде host:port.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.SERVE_WORKERS,
+            help='Число процессов; по умолчанию 2 * число ядер + 1.',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.SERVE_THREADS,
+        )
+        parser.add_argument(
+            '--max-requests', type=int, default=settings.SERVE_MAX_REQUESTS,
+            help='Перезапускать воркер после стольких запросов (0 — никогда).',
+        )
+        parser.add_argument(
+            '--max-requests-jitter', type=int,
+            default=settings.SERVE_MAX_REQUESTS_JITTER,
+            help='Случайная добавка к --max-requests для каждого воркера.',
+        )
+        parser.add_argument(
+            '--max-rss', type=int, default=settings.SERVE_MAX_RSS_MB,
+            help='Перезапускать воркер, если его RSS больше стольких МБ.',
+        )
+        parser.add_argument('--access-log', action='store_true')
+
+    def handle(self, *args, **options):
+        host, _, port = options['bind'].rpartition(':')
+        if not host or not port.isdigit():
+            raise CommandError('--bind ожидает адрес вида host:port.')
+        self.check(include_deployment_checks=not settings.DEBUG)
+        application = get_wsgi_application()
+        # Разбор urlconf при первом запросе достался бы каждому воркеру
+        # отдельно; до форка он делается один раз на всех.
+        get_resolver().url_patterns
+        PreforkServer(
+            application,
+            (host, int(port)),
+            workers=options['workers'],
+            threads=options['threads'],
+            max_requests=options['max_requests'],
+            max_requests_jitter=options['max_requests_jitter'],
+            max_rss_mb=options['max_rss'],
+            graceful_timeout=settings.SERVE_GRACEFUL_TIMEOUT,
+            access_log=options['access_log'],
+            log=self.stdout.write,
+        ).run()
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Скрипт выполняется в отдельном интерпретаторе, чтобы замерять холодный
+# старт, а не уже прогретый процесс manage.py.
+PROFILE_SCRIPT = '''
+import time
+from django.apps.config import AppConfig
+
+timings = []
+original_create = AppConfig.create.__func__
+
+
+def create(cls, entry):
+    config = original_create(cls, entry)
+    for step in ('import_models', 'ready'):
+        method = getattr(config, step)
+
+        def timed(*args, _method=method, _step=step, **kwargs):
+            start = time.perf_counter()
+            _method(*args, **kwargs)
+            timings.append((config.label, _step, time.perf_counter() - start))
+        setattr(config, step, timed)
+    return config
+
+
+AppConfig.create = classmethod(create)
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter() - start
+start = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls = time.perf_counter() - start
+print(f'setup {setup}')
+print(f'urls {urls}')
+for label, step, seconds in timings:
+    print(f'app {label} {step} {seconds}')
+'''
+
+
+class Command(BaseCommand):
+    help = ('Замеряет холодный старт: время импорта модулей, загрузки '
+            'приложений и URLconf.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20)
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.report_startup(result.stdout)
+        self.report_imports(result.stderr, options['top'])
+
+    def report_startup(self, output):
+        self.stdout.write(self.style.MIGRATE_HEADING('Старт Django'))
+        for line in output.splitlines():
+            kind, *rest = line.split()
+            if kind == 'app':
+                label, step, seconds = rest
+                name = f'{label}.{step}()'
+            else:
+                name, seconds = kind, rest[0]
+            self.stdout.write(f'  {name:<40} {float(seconds) * 1000:9.1f} ms')
+
+    def report_imports(self, importtime, top):
+        packages = defaultdict(int)
+        modules = []
+        for line in importtime.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[12:].split('|')
+            module = name.strip()
+            packages[module.split('.')[0]] += int(self_us)
+            modules.append((int(cumulative_us), module))
+        self.stdout.write(
+            self.style.MIGRATE_HEADING('Импорт по пакетам (собственное время)')
+        )
+        for name, us in sorted(packages.items(), key=lambda i: -i[1])[:top]:
+            self.stdout.write(f'  {name:<40} {us / 1000:9.1f} ms')
+        self.stdout.write(
+            self.style.MIGRATE_HEADING('Модули (вместе с зависимостями)')
+        )
+        for us, name in sorted(modules, reverse=True)[:top]:
+            self.stdout.write(f'  {name:<40} {us / 1000:9.1f} ms')
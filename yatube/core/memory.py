@@ -0,0 +1,106 @@
+"""Диагностика памяти воркеров на основе tracemalloc.
+
+Включается настройкой MEMORY_PROFILING. MemoryProfilerMiddleware
+запоминает, на сколько выросла отслеживаемая память за каждый запрос, и
+раз в MEMORY_REPORT_INTERVAL секунд пишет в лог `core.memory` строки
+кода, у которых выделения выросли сильнее всего с прошлого отчёта. При
+нескольких потоках в воркере приросты соседних запросов смешиваются,
+поэтому их стоит смотреть в среднем по множеству запросов.
+"""
+import logging
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def take_snapshot():
+    """Снимок памяти без выделений самого tracemalloc."""
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.total = 0
+        self.largest = 0
+
+    def add(self, delta):
+        self.requests += 1
+        self.total += delta
+        self.largest = max(self.largest, delta)
+
+    @property
+    def average(self):
+        return self.total / self.requests if self.requests else 0
+
+
+class MemoryTracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewStats)
+        self.baseline = None
+        self.last_report = time.monotonic()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.MEMORY_TRACE_FRAMES)
+        self.baseline = take_snapshot()
+
+    def record(self, view_name, delta):
+        with self.lock:
+            self.views[view_name].add(delta)
+            due = (
+                time.monotonic() - self.last_report
+                >= settings.MEMORY_REPORT_INTERVAL
+            )
+            if due:
+                self.last_report = time.monotonic()
+        if due:
+            logger.info(self.growth_report(settings.MEMORY_REPORT_TOP))
+
+    def growth_report(self, top):
+        """Строки кода с наибольшим ростом выделений с прошлого вызова."""
+        snapshot = take_snapshot()
+        previous, self.baseline = self.baseline, snapshot
+        lines = ['Рост памяти с прошлого отчёта:']
+        for stat in snapshot.compare_to(previous, 'lineno')[:top]:
+            lines.append(f'  {stat}')
+        return '\n'.join(lines)
+
+    def report(self, top):
+        """Текстовый отчёт: общая память, крупнейшие выделения, вьюхи."""
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = take_snapshot()
+        lines = [
+            f'Отслеживается: {current / 1024:.1f} KiB, '
+            f'пик: {peak / 1024:.1f} KiB',
+            f'Запросов в connection.queries: '
+            f'{sum(len(c.queries_log) for c in connections.all())}',
+            '',
+            f'Крупнейшие выделения (топ {top}):',
+        ]
+        for stat in snapshot.statistics('lineno')[:top]:
+            lines.append(f'  {stat}')
+        lines += ['', 'Прирост за запрос по вьюхам (KiB):']
+        with self.lock:
+            views = sorted(
+                self.views.items(), key=lambda item: -item[1].average
+            )
+            for name, stats in views:
+                lines.append(
+                    f'  {name:<30} запросов {stats.requests:>6}  '
+                    f'в среднем {stats.average / 1024:8.1f}  '
+                    f'максимум {stats.largest / 1024:8.1f}'
+                )
+        return '\n'.join(lines)
+
+
+tracker = MemoryTracker()
@@ -0,0 +1,125 @@
+import tracemalloc
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from . import context_timing, ratelimit
+from .memory import tracker
+from .prebuilt import load_pages
+
+
+class PrebuiltPageMiddleware:
+    """Отдаёт собранные при деплое страницы без сессии, БД и шаблонов.
+
+    Страница берётся из памяти только для GET/HEAD без cookie сессии: у
+    вошедшего пользователя шапка сайта другая, и такие запросы идут
+    обычным путём.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pages = load_pages(settings.PREBUILT_PAGES_DIR)
+        if not self.pages:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        page = self.pages.get(request.path_info)
+        if (
+            page is None
+            or request.method not in ('GET', 'HEAD')
+            or settings.SESSION_COOKIE_NAME in request.COOKIES
+        ):
+            return self.get_response(request)
+        content, etag = page
+        response = HttpResponse(content)
+        response['ETag'] = etag
+        response['Vary'] = 'Cookie'
+        # Списки ETag, '*' и слабые W/-теги разбирает сама Django.
+        return get_conditional_response(
+            request, etag=etag, response=response
+        )
+
+
+class MemoryProfilerMiddleware:
+    """Считает прирост памяти за запрос по имени вьюхи.
+
+    Работает только при MEMORY_PROFILING: tracemalloc замедляет каждое
+    выделение памяти в несколько раз.
+    """
+
+    def __init__(self, get_response):
+        if not settings.MEMORY_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.tracker = tracker
+        self.tracker.start()
+
+    def __call__(self, request):
+        before = tracemalloc.get_traced_memory()[0]
+        response = self.get_response(request)
+        match = request.resolver_match
+        self.tracker.record(
+            match.view_name if match else request.path_info,
+            tracemalloc.get_traced_memory()[0] - before,
+        )
+        return response
+
+
+class RateLimitMiddleware:
+    """Отвечает 429 на POST сверх политики из RATELIMIT_POLICIES.
+
+    Проверка идёт в process_view, когда имя URL уже известно, но форма
+    ещё не разобрана: отказ не хеширует пароль, а по ключу 'ip' и не
+    обращается к базе.
+    """
+
+    def __init__(self, get_response):
+        if not settings.RATELIMIT_POLICIES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST':
+            return None
+        name = request.resolver_match.view_name
+        policy = settings.RATELIMIT_POLICIES.get(name)
+        if policy is None:
+            return None
+        key, rate = policy
+        retry_after = ratelimit.hit(
+            name, ratelimit.client_key(request, key), rate
+        )
+        if not retry_after:
+            return None
+        response = HttpResponse(
+            'Слишком много запросов, попробуйте позже.',
+            content_type='text/plain; charset=utf-8',
+            status=429,
+        )
+        response['Retry-After'] = str(retry_after)
+        return response
+
+
+class ContextProcessorTimingMiddleware:
+    """Добавляет к ответу Server-Timing со временем контекст-процессоров.
+
+    Работает только при CONTEXT_PROCESSOR_PROFILING.
+    """
+
+    def __init__(self, get_response):
+        if not settings.CONTEXT_PROCESSOR_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        context_timing.instrument_engines()
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        timings = getattr(request, 'context_processor_timings', None)
+        if timings:
+            response['Server-Timing'] = context_timing.server_timing(timings)
+        return response
@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """Письмо в очереди на отправку командой send_outbox.
+
+    Хранится готовое MIME-сообщение, поэтому воркер отправляет его как
+    есть, не собирая заново.
+    """
+    from_email = models.CharField(max_length=254)
+    recipients = models.TextField()
+    message = models.BinaryField()
+    created = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['sent', 'next_attempt'], name='outbox_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.pk}: {self.recipients}'
+
+    @property
+    def recipient_list(self):
+        return self.recipients.split('\n')
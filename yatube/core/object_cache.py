@@ -0,0 +1,114 @@
+"""Кеш экземпляров моделей по первичному или уникальному ключу.
+
+Модель подключается вызовом `register(Model, 'pk', 'slug')`: после этого
+сохранение и удаление экземпляра сбрасывают его записи в кеше. Отсутствие
+объекта тоже кешируется (на OBJECT_CACHE_NEGATIVE_TIMEOUT), а одновременные
+промахи по одному ключу ждут, пока первый запрос загрузит объект.
+
+При смене ключевого поля (переименовании группы или пользователя) старое
+значение читается из базы перед сохранением, и запись под ним тоже
+сбрасывается. Значение поля попадает в ключ кеша в виде хеша: в slug и
+имени пользователя бывают символы, недопустимые в ключах memcached.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.http import Http404
+
+MISSING = 'object-cache:missing'
+LOCK_TIMEOUT = 5
+LOCK_WAIT_STEP = 0.05
+
+registry = {}
+
+
+def cache_key(model, field, value):
+    digest = hashlib.sha256(str(value).encode()).hexdigest()
+    return f'object:{model._meta.label_lower}:{field}:{digest}'
+
+
+def register(model, *fields):
+    """Включает кеширование `model` по перечисленным полям."""
+    registry[model] = fields
+    pre_save.connect(remember_old_values, sender=model, weak=False)
+    post_save.connect(invalidate, sender=model, weak=False)
+    post_delete.connect(invalidate, sender=model, weak=False)
+
+
+def remember_old_values(sender, instance, using, raw=False,
+                        update_fields=None, **kwargs):
+    """Запоминает значения ключевых полей, которые может изменить save()."""
+    fields = [field for field in registry[sender] if field != 'pk']
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    if raw or instance._state.adding or not fields:
+        return
+    instance._object_cache_old_values = sender._default_manager.using(
+        using
+    ).filter(pk=instance.pk).values(*fields).first() or {}
+
+
+def invalidate(sender, instance, **kwargs):
+    old_values = instance.__dict__.pop('_object_cache_old_values', {})
+    keys = {
+        cache_key(sender, field, getattr(instance, field))
+        for field in registry[sender]
+    }
+    keys.update(
+        cache_key(sender, field, value) for field, value in old_values.items()
+    )
+    cache.delete_many(list(keys))
+
+
+def forget(model, field, values):
+    """Сбрасывает записи после изменений в обход save(), например update()."""
+    cache.delete_many([cache_key(model, field, value) for value in values])
+
+
+def wait_for(key):
+    """Ждёт, пока другой процесс положит объект в кеш."""
+    for _ in range(int(LOCK_TIMEOUT / LOCK_WAIT_STEP)):
+        time.sleep(LOCK_WAIT_STEP)
+        obj = cache.get(key)
+        if obj is not None:
+            return obj
+    return None
+
+
+def get_object(model, loader=None, **lookup):
+    """Возвращает экземпляр `model` по одному полю или None.
+
+    `loader` заменяет обычный запрос `filter(**lookup).first()`, например
+    для поиска поста в нужном шарде.
+    """
+    (field, value), = lookup.items()
+    key = cache_key(model, field, value)
+    obj = cache.get(key)
+    if obj is None and not cache.add(f'{key}:lock', 1, LOCK_TIMEOUT):
+        obj = wait_for(key)
+    if obj is None:
+        try:
+            if loader is None:
+                obj = model._default_manager.filter(**lookup).first()
+            else:
+                obj = loader(value)
+            if obj is None:
+                cache.set(
+                    key, MISSING, settings.OBJECT_CACHE_NEGATIVE_TIMEOUT
+                )
+            else:
+                cache.set(key, obj, settings.OBJECT_CACHE_TIMEOUT)
+        finally:
+            cache.delete(f'{key}:lock')
+        return obj
+    return None if obj == MISSING else obj
+
+
+def get_object_or_404(model, loader=None, **lookup):
+    obj = get_object(model, loader=loader, **lookup)
+    if obj is None:
+        raise Http404(f'{model._meta.object_name} не найден')
+    return obj
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который не считает COUNT(*) по всей таблице на каждый запрос.
+
+    Для запросов без фильтров число строк берётся из кеша и обновляется раз в
+    PAGINATOR_COUNT_TIMEOUT секунд. Отфильтрованные запросы считаются точно:
+    их COUNT идёт по индексу и затрагивает только подходящие строки.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return super().count
+        key = f'paginator-count:{query.model._meta.label_lower}'
+        return cache.get_or_set(
+            key,
+            lambda: Paginator.count.func(self),
+            settings.PAGINATOR_COUNT_TIMEOUT,
+        )
@@ -0,0 +1,61 @@
+"""Заранее отрисованные страницы, которые не меняются от запроса к запросу.
+
+Страницы из PREBUILT_PAGES рендерятся командой `build_static_pages` при
+деплое в каталог PREBUILT_PAGES_DIR, а PrebuiltPageMiddleware отдаёт их
+анонимным посетителям из памяти.
+"""
+import hashlib
+import json
+import os
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from django.urls import resolve, reverse
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def render_page(path):
+    """Рендерит страницу так, как её видит анонимный посетитель."""
+    match = resolve(path)
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.user = AnonymousUser()
+    request.resolver_match = match
+    response = match.func(request, *match.args, **match.kwargs)
+    response.render()
+    return response.content
+
+
+def build_pages(url_names, directory):
+    """Сохраняет страницы и манифест с их ETag, возвращает манифест."""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {}
+    for url_name in url_names:
+        path = reverse(url_name)
+        content = render_page(path)
+        filename = url_name.replace(':', '-') + '.html'
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(content)
+        manifest[path] = {
+            'file': filename,
+            'etag': '"%s"' % hashlib.sha256(content).hexdigest()[:32],
+        }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_pages(directory):
+    """Читает собранные страницы в словарь {путь: (содержимое, ETag)}."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    pages = {}
+    for path, entry in manifest.items():
+        with open(os.path.join(directory, entry['file']), 'rb') as f:
+            pages[path] = (f.read(), entry['etag'])
+    return pages
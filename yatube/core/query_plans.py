@@ -0,0 +1,52 @@
+"""Сбор SQL-запросов и разбор их планов для тестов.
+
+`capture_queries()` записывает запросы вместе с параметрами, а
+`plan_problems()` прогоняет каждый SELECT через EXPLAIN QUERY PLAN
+(SQLite) и возвращает строки плана с полным проходом по таблице или
+временным B-деревом для ORDER BY.
+"""
+from contextlib import contextmanager
+
+from django.db import connection
+
+# Маленькие справочники, которые читаются целиком по смыслу.
+FULL_SCAN_ALLOWED = {'posts_group', 'django_content_type'}
+
+
+@contextmanager
+def capture_queries(using=connection):
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with using.execute_wrapper(record):
+        yield queries
+
+
+def explain(sql, params, using=connection):
+    with using.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def is_full_scan(detail):
+    """'SCAN posts_post' без индекса; старый SQLite пишет 'SCAN TABLE'."""
+    words = detail.split()
+    if words[0] != 'SCAN' or 'USING' in words:
+        return False
+    table = words[2] if words[1] == 'TABLE' else words[1]
+    return table not in FULL_SCAN_ALLOWED
+
+
+def plan_problems(queries, using=connection):
+    """Список (sql, строка плана) для плохих планов среди SELECT."""
+    problems = []
+    for sql, params in queries:
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        for detail in explain(sql, params, using):
+            if is_full_scan(detail) or 'TEMP B-TREE FOR ORDER BY' in detail:
+                problems.append((sql, detail))
+    return problems
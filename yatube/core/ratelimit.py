@@ -0,0 +1,76 @@
+"""Ограничение частоты запросов к формам записи и входа.
+
+Политики задаются в RATELIMIT_POLICIES: имя URL → (ключ, частота), где
+ключ — 'ip' или 'user' (id вошедшего пользователя, а для анонима — IP), а
+частота — строка вида '10/m'. Ключ никогда не берётся из того, что клиент
+может подставить сам: новая cookie сессии не даёт нового лимита. Счётчики
+лежат в кеше RATELIMIT_CACHE и растут атомарным incr; чтобы на стыке
+окон не проходило двойное число запросов, к текущему окну добавляется
+взвешенный остаток предыдущего (скользящее окно). Отказ по ключу 'ip'
+обходится в два обращения к кешу без сессии и базы; для ключа 'user'
+сначала читается сессия (на проде — из кеша).
+
+Кеш должен быть общим для всех процессов (memcached): с locmem каждый
+воркер считает запросы отдельно, а у файлового кеша incr не атомарен.
+
+За обратным прокси REMOTE_ADDR у всех запросов один и тот же, поэтому
+для адресов из RATELIMIT_TRUSTED_PROXIES IP клиента берётся из
+X-Forwarded-For.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/m' → (10, 60)."""
+    count, period = rate.split('/')
+    return int(count), RATE_PERIODS[period]
+
+
+def client_ip(request):
+    """Адрес клиента с учётом доверенных прокси.
+
+    X-Forwarded-For читается справа налево до первого адреса, который не
+    является доверенным прокси: левые записи клиент может подделать.
+    """
+    trusted = settings.RATELIMIT_TRUSTED_PROXIES
+    address = request.META.get('REMOTE_ADDR', '')
+    if address not in trusted:
+        return address
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+    for hop in reversed(forwarded):
+        hop = hop.strip()
+        if hop and hop not in trusted:
+            return hop
+    return address
+
+
+def client_key(request, key):
+    if key == 'user' and request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return 'ip:' + client_ip(request)
+
+
+def hit(name, client, rate, now=None):
+    """Учитывает запрос; возвращает 0 или через сколько секунд повторить."""
+    limit, period = parse_rate(rate)
+    cache = caches[settings.RATELIMIT_CACHE]
+    now = time.time() if now is None else now
+    window, elapsed = divmod(now, period)
+    key = f'ratelimit:{name}:{client}:{int(window)}'
+    cache.add(key, 0, period * 2)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Ключ вытеснили между add и incr.
+        cache.set(key, 1, period * 2)
+        count = 1
+    previous = cache.get(f'ratelimit:{name}:{client}:{int(window) - 1}', 0)
+    if count + previous * (1 - elapsed / period) <= limit:
+        return 0
+    return max(1, math.ceil(period - elapsed))
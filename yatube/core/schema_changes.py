@@ -0,0 +1,175 @@
+"""Помощники для изменения схемы без остановки сайта.
+
+На SQLite любые AlterField/RemoveField/AddField пересобирают таблицу
+целиком и держат блокировку на всё время копирования. Здесь собраны
+операции, которые вместо этого работают короткими транзакциями:
+
+* AddIndexConcurrently — CREATE INDEX CONCURRENTLY там, где он есть
+  (PostgreSQL), и обычный CREATE INDEX на остальных базах. Миграция с этой
+  операцией должна быть объявлена с `atomic = False`.
+* AddFieldInPlace — AddField для столбца с постоянным значением по
+  умолчанию: на SQLite это один ALTER TABLE ADD COLUMN без копирования
+  строк.
+* backfill — заполняет поле пачками по первичному ключу.
+* copy_table_in_chunks — копирует таблицу в новую пачками с отчётом о
+  ходе работы, чтобы затем переименовать её вместо пересборки.
+"""
+import sys
+
+from django.db import migrations, transaction
+
+REBUILDS_TABLE = 'пересборка таблицы'
+CHEAP = 'без блокировки данных'
+DATA = 'изменение данных'
+
+OPERATION_COST = {
+    'AddIndex': CHEAP,
+    'AddIndexConcurrently': CHEAP,
+    'AddFieldInPlace': CHEAP,
+    'RemoveIndex': CHEAP,
+    'CreateModel': CHEAP,
+    'DeleteModel': CHEAP,
+    'AlterModelOptions': CHEAP,
+    'AlterModelManagers': CHEAP,
+    'AddField': REBUILDS_TABLE,
+    'AlterField': REBUILDS_TABLE,
+    'RemoveField': REBUILDS_TABLE,
+    'RenameField': REBUILDS_TABLE,
+    'AlterUniqueTogether': REBUILDS_TABLE,
+    'AlterIndexTogether': CHEAP,
+    'RunPython': DATA,
+    'RunSQL': DATA,
+}
+
+
+def operation_cost(operation):
+    return OPERATION_COST.get(operation.__class__.__name__, REBUILDS_TABLE)
+
+
+def report(message):
+    sys.stdout.write(message + '\n')
+    sys.stdout.flush()
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """AddIndex, который не блокирует запись на PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias,
+                                        model):
+            return
+        if schema_editor.connection.vendor != 'postgresql':
+            schema_editor.add_index(model, self.index)
+            return
+        statement = str(self.index.create_sql(model, schema_editor))
+        schema_editor.execute(
+            statement.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1)
+        )
+
+    def describe(self):
+        return super().describe() + ' concurrently'
+
+
+class AddFieldInPlace(migrations.AddField):
+    """AddField, который на SQLite не пересобирает таблицу.
+
+    SQLite умеет добавить столбец NOT NULL, если у него есть значение по
+    умолчанию, но Django 2.2 всё равно копирует таблицу. Подходит для
+    полей с константным `default` без уникальности и внешних ключей;
+    для остальных полей и других баз работает как обычный AddField.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        field = model._meta.get_field(self.name)
+        if (
+            schema_editor.connection.vendor != 'sqlite'
+            or not field.has_default()
+            or callable(field.default)
+            or field.unique
+            or field.remote_field is not None
+        ):
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+            return
+        if not self.allow_migrate_model(schema_editor.connection.alias,
+                                        model):
+            return
+        # SQLite не принимает параметры в DDL, значение подставляется
+        # литералом.
+        default = schema_editor.quote_value(
+            schema_editor.effective_default(field)
+        )
+        definition = schema_editor.column_sql(model, field)[0]
+        check = field.db_parameters(schema_editor.connection)['check']
+        if check:
+            definition += f' CHECK ({check})'
+        quote = schema_editor.quote_name
+        schema_editor.execute(
+            f'ALTER TABLE {quote(model._meta.db_table)} '
+            f'ADD COLUMN {quote(field.column)} {definition} '
+            f'DEFAULT {default}'
+        )
+
+    def describe(self):
+        return super().describe() + ' in place'
+
+
+def backfill(model, values, batch_size=1000, progress=report, **filters):
+    """Проставляет `values` строкам `model` пачками по первичному ключу.
+
+    Каждая пачка обновляется в своей транзакции, поэтому запись в таблицу
+    блокируется только на время одного UPDATE. Вызывать из RunPython в
+    миграции с `atomic = False`.
+    """
+    last_pk = 0
+    done = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_pk, **filters)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return done
+        with transaction.atomic():
+            model.objects.filter(pk__in=ids).update(**values)
+        last_pk = ids[-1]
+        done += len(ids)
+        progress(f'{model._meta.db_table}: обновлено {done}')
+
+
+def copy_table_in_chunks(connection, source, target, columns,
+                         batch_size=1000, progress=report):
+    """Копирует строки `source` в `target` пачками по столбцу `id`.
+
+    Используется вместо пересборки таблицы: новая таблица создаётся рядом,
+    заполняется короткими транзакциями и затем переименовывается. Из
+    RunPython передавайте `schema_editor.connection`.
+    """
+    quote = connection.ops.quote_name
+    column_list = ', '.join(quote(column) for column in columns)
+    sql = (
+        f'INSERT INTO {quote(target)} ({column_list}) '
+        f'SELECT {column_list} FROM {quote(source)} '
+        f'WHERE {quote("id")} > %s ORDER BY {quote("id")} LIMIT %s'
+    )
+    last_id = 0
+    done = 0
+    while True:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [last_id, batch_size])
+                copied = cursor.rowcount
+                cursor.execute(
+                    f'SELECT MAX({quote("id")}) FROM {quote(target)}'
+                )
+                last_id = cursor.fetchone()[0] or 0
+        if copied <= 0:
+            return done
+        done += copied
+        progress(f'{source} -> {target}: скопировано {done}')
@@ -0,0 +1,261 @@
+"""Предфорковый WSGI-сервер для `manage.py serve`.
+
+Мастер загружает приложение до форка и замораживает сборщик мусора
+(gc.freeze), поэтому код и данные Django остаются общими для всех
+воркеров по copy-on-write. Каждый воркер принимает соединения с общего
+сокета и обрабатывает их пулом потоков. Воркер перезапускается после
+`max_requests` запросов (со случайным разбросом, чтобы воркеры не
+уходили одновременно) или когда его RSS превышает `max_rss_mb`.
+SIGTERM и SIGINT останавливают сервер мягко: воркеры дорабатывают
+начатые запросы, пока не выйдет `graceful_timeout`. Воркер, упавший
+вскоре после запуска, перезапускается с растущей паузой, чтобы ошибка
+в коде или настройках не превращалась в бесконечный цикл форков.
+"""
+import gc
+import os
+import random
+import resource
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django.db import connections
+
+from .signals import worker_stopping
+
+# Воркер, проживший меньше этого, считается упавшим при запуске.
+MIN_WORKER_UPTIME = 5
+RESPAWN_DELAY = 0.5
+RESPAWN_DELAY_MAX = 30
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_workers():
+    return 2 * cpu_count() + 1
+
+
+def rss_mb():
+    """Текущий RSS процесса в мегабайтах (без /proc — пиковый)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты.
+    if sys.platform == 'darwin':
+        return usage / 1024 / 1024
+    return usage / 1024
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    access_log = False
+
+    def log_message(self, format, *args):
+        if self.access_log:
+            super().log_message(format, *args)
+
+
+class PooledWSGIServer(WSGIServer):
+    """WSGIServer поверх готового сокета, обрабатывающий запросы пулом."""
+
+    def __init__(self, sock, threads, handler=QuietRequestHandler):
+        super().__init__(
+            sock.getsockname()[:2], handler, bind_and_activate=False
+        )
+        self.socket.close()
+        self.socket = sock
+        host, port = sock.getsockname()[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(sock, selectors.EVENT_READ)
+        self.pool = ThreadPoolExecutor(threads)
+        self.slots = threading.BoundedSemaphore(threads)
+        self.slot_passed = False
+        self.handled = 0
+        self.lock = threading.Lock()
+
+    def wait_and_handle(self, timeout):
+        """Ждёт соединение до `timeout` секунд и передаёт его в пул.
+
+        handle_request() здесь не подходит: на неблокирующем сокете он
+        не ждёт вовсе. Соединение принимается, только когда в пуле есть
+        свободный поток: иначе воркер копил бы в очереди пула соединения,
+        которые сразу обработали бы другие воркеры.
+        """
+        if not self.slots.acquire(timeout=timeout):
+            return
+        self.slot_passed = False
+        try:
+            if self.selector.select(timeout):
+                self._handle_request_noblock()
+        finally:
+            if not self.slot_passed:
+                self.slots.release()
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_in_pool, request, client_address)
+        self.slot_passed = True
+
+    def process_in_pool(self, request, client_address):
+        try:
+            request.setblocking(True)
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self.lock:
+                self.handled += 1
+            self.slots.release()
+
+    def server_close(self):
+        self.selector.close()
+        self.pool.shutdown(wait=True)
+        super().server_close()
+
+
+class PreforkServer:
+    def __init__(self, application, bind, workers=None, threads=2,
+                 max_requests=0, max_requests_jitter=0, max_rss_mb=0,
+                 graceful_timeout=30, access_log=False, log=print):
+        self.application = application
+        self.bind = bind
+        self.workers = workers or default_workers()
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.max_rss_mb = max_rss_mb
+        self.graceful_timeout = graceful_timeout
+        QuietRequestHandler.access_log = access_log
+        self.log = log
+        self.children = {}
+        self.running = True
+        self.crashes = 0
+        self.spawn_after = 0
+
+    def run(self):
+        self.socket = socket.create_server(self.bind, backlog=2048)
+        # Неблокирующий accept: соединение забирает один воркер, остальные
+        # получают BlockingIOError и возвращаются к ожиданию.
+        self.socket.setblocking(False)
+        # Соединения с базой открываются заново в каждом воркере: сокет
+        # SQLite или PostgreSQL нельзя делить между процессами.
+        connections.close_all()
+        gc.collect()
+        gc.freeze()
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.log(
+            f'Слушаю http://{self.bind[0]}:{self.socket.getsockname()[1]}/, '
+            f'воркеров: {self.workers}, потоков: {self.threads}'
+        )
+        while self.running:
+            while (
+                len(self.children) < self.workers
+                and time.monotonic() >= self.spawn_after
+            ):
+                self.spawn()
+            if not self.reap():
+                time.sleep(0.2)
+        self.shutdown()
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+        code = 0
+        try:
+            self.work()
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        # os._exit не даёт воркеру вернуться в код мастера, но и atexit
+        # пропускает: буферы воркера сбрасывают получатели сигнала.
+        for receiver, error in worker_stopping.send_robust(sender=self):
+            if error is not None:
+                traceback.print_exception(
+                    type(error), error, error.__traceback__
+                )
+                code = 1
+        os._exit(code)
+
+    def reap(self):
+        """Забирает завершившийся воркер, если такой есть."""
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return False
+        if pid:
+            self.record_exit(pid, status)
+        return bool(pid)
+
+    def record_exit(self, pid, status):
+        """Убирает воркер из списка и откладывает запуск после падения."""
+        started = self.children.pop(pid, None)
+        if started is None:
+            return
+        uptime = time.monotonic() - started
+        clean = os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        if clean or uptime >= MIN_WORKER_UPTIME:
+            self.crashes = 0
+            return
+        self.crashes += 1
+        delay = min(RESPAWN_DELAY * 2 ** (self.crashes - 1), RESPAWN_DELAY_MAX)
+        self.spawn_after = time.monotonic() + delay
+        self.log(
+            f'Воркер {pid} упал через {uptime:.1f} с после запуска, '
+            f'следующий запуск через {delay:.1f} с'
+        )
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def shutdown(self):
+        for pid in self.children:
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            if not self.reap():
+                time.sleep(0.1)
+        for pid in self.children:
+            os.kill(pid, signal.SIGKILL)
+        self.socket.close()
+
+    def work(self):
+        alive = True
+
+        def stop(signum, frame):
+            nonlocal alive
+            alive = False
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        limit = self.max_requests
+        if limit and self.max_requests_jitter:
+            limit += random.randint(0, self.max_requests_jitter)
+        server = PooledWSGIServer(self.socket, self.threads)
+        server.set_app(self.application)
+        while alive:
+            server.wait_and_handle(timeout=1)
+            if limit and server.handled >= limit:
+                break
+            if self.max_rss_mb and rss_mb() > self.max_rss_mb:
+                break
+        server.server_close()
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Воркер `manage.py serve` завершается через os._exit, и обработчики
+# atexit в нём не выполняются. Буферы в памяти процесса сбрасываются
+# по этому сигналу.
+worker_stopping = Signal()
@@ -0,0 +1,117 @@
+import os
+import time
+import unittest
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.test import SimpleTestCase
+from django.test.runner import DiscoverRunner, default_test_processes
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    """Результат прогона, который запоминает длительность каждого теста."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations = []
+
+    def startTest(self, test):
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.durations.append((time.perf_counter() - self._started, test))
+
+
+class TimedTextTestRunner(unittest.TextTestRunner):
+    resultclass = TimedTextTestResult
+    slowest = 10
+
+    def run(self, test):
+        result = super().run(test)
+        self.stream.writeln(f'Самые медленные тесты (топ {self.slowest}):')
+        for seconds, case in sorted(result.durations, reverse=True)[
+            :self.slowest
+        ]:
+            self.stream.writeln(f'  {seconds * 1000:8.1f} ms  {case.id()}')
+        return result
+
+
+def clear_caches_first(pre_setup):
+    def wrapper(test):
+        for cache in caches.all():
+            cache.clear()
+        pre_setup(test)
+    return wrapper
+
+
+class FastTestRunner(DiscoverRunner):
+    """Прогон тестов с сохранением тестовой базы и по всем ядрам.
+
+    По умолчанию мигрированная тестовая база сохраняется между запусками
+    (`--keepdb`), а тесты раздаются процессам по числу ядер, у каждого
+    процесса своя копия базы. `--timing` печатает самые медленные тесты;
+    для точных замеров он запускает тесты в одном процессе.
+    """
+    # Тестовые базы SQLite хранятся в файлах test_<alias>.sqlite3, а не в
+    # памяти: иначе сохранять между запусками было бы нечего.
+    db_name_template = 'test_{alias}.sqlite3'
+
+    def __init__(self, timing=False, **kwargs):
+        if timing:
+            kwargs['parallel'] = 1
+            self.test_runner = TimedTextTestRunner
+        super().__init__(**kwargs)
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--timing', action='store_true',
+            help='Печатать время самых медленных тестов.',
+        )
+        parser.add_argument(
+            '--no-keepdb', action='store_false', dest='keepdb',
+            help='Пересоздать тестовую базу с нуля.',
+        )
+        parser.set_defaults(keepdb=True, parallel=default_test_processes())
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        # Просмотры пишутся сразу, чтобы буфер счётчика не переживал
+        # тестовую базу и не сбрасывался при выходе в рабочую.
+        settings.VIEW_COUNT_FLUSH_INTERVAL = 0
+        # Кеши живут весь прогон, и страницы, закешированные одним тестом,
+        # подменяли бы данные следующего. Каждый тест начинает с пустых
+        # кешей.
+        self.original_pre_setup = SimpleTestCase._pre_setup
+        SimpleTestCase._pre_setup = clear_caches_first(self.original_pre_setup)
+
+    def teardown_test_environment(self, **kwargs):
+        SimpleTestCase._pre_setup = self.original_pre_setup
+        super().teardown_test_environment(**kwargs)
+
+    def setup_databases(self, **kwargs):
+        for connection in connections.all():
+            test_settings = connection.settings_dict['TEST']
+            if connection.vendor == 'sqlite' and not test_settings['NAME']:
+                test_settings['NAME'] = os.path.join(
+                    settings.BASE_DIR,
+                    self.db_name_template.format(alias=connection.alias),
+                )
+            if connection.vendor == 'sqlite':
+                self.remove_stale_clones(connection)
+        return super().setup_databases(**kwargs)
+
+    def remove_stale_clones(self, connection):
+        # Django не обновляет копии базы для процессов при --keepdb, а новые
+        # миграции применяет только к основной базе. Копирование файла
+        # дешёвое, поэтому копии пересоздаются на каждом запуске.
+        # Имена копий строятся так же, как в DatabaseCreation для SQLite.
+        root, ext = os.path.splitext(connection.settings_dict['TEST']['NAME'])
+        for number in range(1, self.parallel + 1):
+            clone = f'{root}_{number}.{ext}'
+            if os.path.exists(clone):
+                os.remove(clone)
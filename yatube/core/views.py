@@ -0,0 +1,22 @@
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+
+from .memory import tracker
+
+
+@staff_member_required
+def memory_report(request):
+    """Отчёт о памяти воркера, обработавшего запрос."""
+    if not tracemalloc.is_tracing():
+        raise Http404('Профилирование памяти выключено')
+    try:
+        top = int(request.GET.get('top', settings.MEMORY_REPORT_TOP))
+    except ValueError:
+        return HttpResponseBadRequest('top должен быть целым числом')
+    top = min(max(top, 1), settings.MEMORY_REPORT_MAX_TOP)
+    return HttpResponse(
+        tracker.report(top), content_type='text/plain; charset=utf-8'
+    )
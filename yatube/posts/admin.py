@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from core.paginator import CachedCountPaginator
 from .models import Group, Post
 
 
@@ -10,11 +11,36 @@ class PostAdmin(admin.ModelAdmin):
         'pub_date',
         'author',
         'group',
+        'views',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    paginator = CachedCountPaginator
+    show_full_result_count = False
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'group':
+            # Список групп для редактируемой колонки запрашивается один раз
+            # на страницу, а не для каждой строки.
+            choices = getattr(request, '_group_choices', None)
+            if choices is None:
+                choices = list(iter(formfield.choices))
+                request._group_choices = choices
+            formfield.choices = choices
+        return formfield
+
+    def get_search_results(self, request, queryset, search_term):
+        # Числовой запрос ищет пост по id через первичный ключ, без LIKE
+        # по всему тексту.
+        if search_term.strip().isdigit():
+            return queryset.filter(pk=int(search_term)), False
+        return super().get_search_results(request, queryset, search_term)
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -25,6 +51,8 @@ class GroupAdmin(admin.ModelAdmin):
     )
     search_fields = ('title',)
     empty_value_display = '-пусто-'
+    paginator = CachedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(Post, PostAdmin)
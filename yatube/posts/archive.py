@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import sharding
+from .models import ArchivedPost, Post
+
+ARCHIVED_FIELDS = (
+    'id', 'text', 'text_html', 'text_html_version', 'pub_date', 'author_id',
+    'group_id', 'comment_count',
+)
+
+
+def archive_batch(horizon, batch_size, using='default'):
+    """Переносит в архив одну пачку постов старше `horizon` из базы `using`.
+
+    Архив лежит в `default`. Пачка копируется и удаляется в транзакциях
+    обеих баз, а копирование не трогает уже перенесённые строки, поэтому
+    прерванный перенос можно просто запустить заново. Возвращает число
+    перенесённых постов.
+    """
+    with transaction.atomic(), transaction.atomic(using=using):
+        rows = list(
+            Post.objects.using(using).filter(pub_date__lt=horizon)
+            .order_by('pub_date')
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ArchivedPost.objects.bulk_create(
+            [ArchivedPost(**row) for row in rows],
+            ignore_conflicts=True,
+        )
+        Post.objects.using(using).filter(
+            pk__in=[row['id'] for row in rows]
+        ).delete()
+    return len(rows)
+
+
+def archive_posts(days, batch_size, progress=None):
+    """Переносит в архив посты старше `days` дней пачками из всех шардов."""
+    horizon = timezone.now() - timedelta(days=days)
+    total = 0
+    for alias in sharding.shards() or ['default']:
+        while True:
+            moved = archive_batch(horizon, batch_size, using=alias)
+            if not moved:
+                break
+            total += moved
+            if progress is not None:
+                progress(total)
+    return total
+
+
+class ArchiveFallbackList:
+    """Последовательность для Paginator: сначала свежие посты, затем архив.
+
+    Обе части упорядочены по дате, а архив всегда старше ленты, поэтому
+    страницы склеиваются простой конкатенацией. Архив читается только
+    для страниц за пределами свежих постов.
+    """
+
+    def __init__(self, recent, archived):
+        self.recent = recent
+        self.archived = archived
+
+    def recent_count(self):
+        if not hasattr(self, '_recent_count'):
+            self._recent_count = self.recent.count()
+        return self._recent_count
+
+    def count(self):
+        return self.recent_count() + self.archived.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        split = self.recent_count()
+        items = []
+        if start < split:
+            items.extend(self.recent[start:min(stop, split)])
+        if stop > split:
+            items.extend(self.archived[max(start - split, 0):stop - split])
+        return items
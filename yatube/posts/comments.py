@@ -0,0 +1,88 @@
+"""Комментарии к посту: постраничное чтение ветки по курсору.
+
+Страница читает COMMENTS_ON_PAGE комментариев, которые идут после
+курсора в порядке `(created, pk)`, одним запросом по индексу
+`(post_id, created)` вместе с авторами. OFFSET здесь не нужен, поэтому
+тысячная страница популярного поста читается так же быстро, как первая.
+Число комментариев хранится в `Post.comment_count` и меняется вместе с
+записью комментария.
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import F
+
+from core import object_cache
+from . import sharding
+from .models import ArchivedPost, Comment, Post, PostLocation
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MAX_PK = 2 ** 63 - 1
+
+
+def encode_cursor(comment):
+    micros = (comment.created - EPOCH) // timedelta(microseconds=1)
+    return f'{micros}.{comment.pk}'
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (created, pk); ValueError для испорченного курсора."""
+    micros, pk = cursor.split('.')
+    pk = int(pk)
+    if not 0 <= pk <= MAX_PK:
+        raise ValueError(f'pk вне диапазона: {pk}')
+    try:
+        created = EPOCH + timedelta(microseconds=int(micros))
+    except OverflowError as error:
+        raise ValueError(str(error)) from error
+    return created, pk
+
+
+def comment_page(post_id, cursor=None):
+    """Страница комментариев после `cursor` и курсор следующей страницы."""
+    size = settings.COMMENTS_ON_PAGE
+    comments = Comment.objects.filter(post_id=post_id).select_related(
+        'author'
+    )
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        comments = comments.filter(created__gte=created).exclude(
+            created=created, pk__lte=pk
+        )
+    page = list(comments[:size + 1])
+    if len(page) > size:
+        return page[:size], encode_cursor(page[size - 1])
+    return page, None
+
+
+def post_location(post_id):
+    if not sharding.is_enabled():
+        return 'default'
+    return PostLocation.objects.filter(pk=post_id).values_list(
+        'shard', flat=True
+    ).first()
+
+
+def comment_added(comment):
+    using = post_location(comment.post_id)
+    if using is None:
+        return
+    Post.objects.using(using).filter(pk=comment.post_id).update(
+        comment_count=F('comment_count') + 1
+    )
+    object_cache.forget(Post, 'pk', [comment.post_id])
+
+
+def post_removed(post, using):
+    """Удаляет комментарии удалённого поста.
+
+    Архивированный или перенесённый в другой шард пост остаётся на
+    сайте с тем же id, и его комментарии не трогаются.
+    """
+    if sharding.is_enabled() and (
+        sharding.shard_for_author(post.author_id) != using
+    ):
+        return
+    if ArchivedPost.objects.filter(pk=post.pk).exists():
+        return
+    Comment.objects.filter(post_id=post.pk).delete()
@@ -0,0 +1,47 @@
+"""Правка поста с оптимистической блокировкой.
+
+Каждая правка увеличивает `Post.version`. Запись делается одним
+`UPDATE ... WHERE id = %s AND version = %s` и только по изменённым полям,
+поэтому блокировка базы держится на время одного короткого запроса, а
+правка поверх чужой, более свежей версии не проходит.
+"""
+from django.db.models import F
+from django.db.models.signals import post_save, pre_save
+
+from .models import RENDERED_FIELDS, Post
+
+
+class EditConflict(Exception):
+    """Пост изменили после того, как его открыли для правки."""
+
+
+def save_changes(post, fields, version=None):
+    """Сохраняет поля `fields` поста, если его версия равна `version`.
+
+    Без `version` сравнивается версия, с которой пост был загружен.
+    Сигналы pre_save и post_save отправляются с `update_fields`, как
+    при обычном `save(update_fields=...)`.
+    """
+    expected = post.version if version is None else version
+    if 'text' in fields:
+        post.render_text()
+        fields = [*fields, *RENDERED_FIELDS]
+    using = post._state.db
+    update_fields = frozenset(fields)
+    pre_save.send(
+        sender=Post, instance=post, raw=False, using=using,
+        update_fields=update_fields,
+    )
+    updated = Post.objects.using(using).filter(
+        pk=post.pk, version=expected
+    ).update(
+        version=F('version') + 1,
+        **{field: getattr(post, field) for field in fields}
+    )
+    if not updated:
+        raise EditConflict(post.pk)
+    post.version = expected + 1
+    post_save.send(
+        sender=Post, instance=post, created=False, raw=False, using=using,
+        update_fields=update_fields,
+    )
@@ -0,0 +1,81 @@
+"""Atom-ленты групп и авторов из кеша.
+
+Документ ленты собирается один раз и хранится в кеше под ключом с
+версией. Любое изменение постов группы или автора (а также переименование)
+меняет версию, и следующий запрос соберёт документ заново; без изменений
+лента отдаётся из кеша без обращения к базе. В ключ входит и хост
+запроса, потому что ссылки в Atom абсолютные.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+
+def version_key(kind, object_id):
+    return f'atom-version:{kind}:{object_id}'
+
+
+def version(kind, object_id):
+    """Текущая версия ленты.
+
+    Пропавшая из кеша версия заменяется новой, а не нулём: иначе мог бы
+    вернуться документ, собранный до последнего изменения.
+    """
+    key = version_key(kind, object_id)
+    current = cache.get(key)
+    if current is None:
+        cache.add(key, time.time_ns(), None)
+        current = cache.get(key)
+    return current
+
+
+def invalidate(kind, *object_ids):
+    for object_id in set(object_ids):
+        if object_id is not None:
+            cache.set(version_key(kind, object_id), time.time_ns(), None)
+
+
+def posts_changed(author_id, *group_ids):
+    invalidate('author', author_id)
+    invalidate('group', *group_ids)
+
+
+def build(request, title, link, posts):
+    feed = Atom1Feed(
+        title=title,
+        link=request.build_absolute_uri(link),
+        description='',
+        # Без строки запроса: документ кешируется без неё.
+        feed_url=request.build_absolute_uri(request.path),
+        language=settings.LANGUAGE_CODE,
+    )
+    for post in posts:
+        url = request.build_absolute_uri(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        feed.add_item(
+            title=Truncator(post.text).words(10),
+            link=url,
+            unique_id=url,
+            description=post.html,
+            author_name=post.author.get_full_name() or post.author.username,
+            pubdate=post.pub_date,
+        )
+    return feed.writeString('utf-8')
+
+
+def document(request, kind, object_id, builder):
+    """Документ ленты из кеша; `builder()` вызывается только при промахе."""
+    key = (
+        f'atom:{kind}:{object_id}:{version(kind, object_id)}:'
+        f'{request.get_host()}'
+    )
+    content = cache.get(key)
+    if content is None:
+        content = builder()
+        cache.set(key, content, settings.FEED_TIMEOUT)
+    return content
@@ -1,6 +1,6 @@
 from django import forms
 
-from .models import Post
+from .models import Comment, Post
 
 
 class PostForm(forms.ModelForm):
@@ -15,3 +15,13 @@ class PostForm(forms.ModelForm):
         help_text = {
             'text': ('Введите текст в это поле')
         }
+
+
+class CommentForm(forms.ModelForm):
+    class Meta:
+        model = Comment
+
+        fields = ('text',)
+        labels = {
+            'text': ('Текст комментария'),
+        }
@@ -0,0 +1,127 @@
+"""Кеш первых страниц ленты группы.
+
+В кеше лежат id первых GROUP_FEED_CACHED_PAGES страниц группы и число её
+постов. Страница из этого диапазона собирается одним запросом по id,
+остальные страницы читаются обычной выборкой. В кеш попадают только
+горячие группы: ленту открыли GROUP_FEED_HOT_HITS раз за
+GROUP_FEED_TIMEOUT секунд (счётчик открытий тоже лежит в кеше). Холодные
+группы читаются обычной выборкой и место в кеше не занимают. Создание,
+удаление и перенос поста между группами пересобирают списки только тех
+групп, которые сейчас в кеше. Удаление поста за пределами первых страниц
+только уменьшает число постов.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import sharding
+from .models import Post
+
+
+def cache_key(group_id):
+    return f'group-feed:{group_id}'
+
+
+def hits_key(group_id):
+    return f'group-feed-hits:{group_id}'
+
+
+def cached_size():
+    return settings.GROUP_FEED_CACHED_PAGES * settings.POSTS_ON_PAGE
+
+
+def load(group_id):
+    """Читает id первых страниц группы и кладёт их в кеш."""
+    posts = sharding.scatter(
+        Post.objects.filter(group_id=group_id).only('pub_date')
+    )
+    entry = {
+        'ids': [(post._state.db, post.pk) for post in posts[:cached_size()]],
+        'count': posts.count(),
+    }
+    cache.set(cache_key(group_id), entry, settings.GROUP_FEED_TIMEOUT)
+    return entry
+
+
+def is_hot(group_id):
+    """Учитывает открытие ленты и говорит, стоит ли её кешировать."""
+    key = hits_key(group_id)
+    cache.add(key, 0, settings.GROUP_FEED_TIMEOUT)
+    try:
+        hits = cache.incr(key)
+    except ValueError:
+        # Счётчик вытеснили между add и incr.
+        hits = 1
+    return hits >= settings.GROUP_FEED_HOT_HITS
+
+
+def refresh(*group_ids):
+    """Пересобирает закешированные ленты групп после изменения постов."""
+    for group_id in set(group_ids):
+        if (
+            group_id is not None
+            and cache.get(cache_key(group_id)) is not None
+        ):
+            load(group_id)
+
+
+def forget(post):
+    """Убирает удалённый пост из закешированной ленты его группы.
+
+    Старые посты (например, при архивации) в первые страницы не входят,
+    и для них достаточно поправить число постов без запроса к базе.
+    """
+    key = cache_key(post.group_id)
+    entry = cache.get(key) if post.group_id is not None else None
+    if entry is None:
+        return
+    if (post._state.db, post.pk) in entry['ids']:
+        load(post.group_id)
+    else:
+        entry['count'] -= 1
+        cache.set(key, entry, settings.GROUP_FEED_TIMEOUT)
+
+
+def hydrate(ids):
+    """Загружает посты по списку пар (база, id), сохраняя порядок."""
+    by_database = defaultdict(list)
+    for using, post_id in ids:
+        by_database[using].append(post_id)
+    found = {}
+    for using, post_ids in by_database.items():
+        posts = Post.objects.using(using).select_related('author', 'group')
+        for post_id, post in posts.in_bulk(post_ids).items():
+            found[using, post_id] = post
+    return [found[key] for key in ids if key in found]
+
+
+class GroupFeed:
+    """Последовательность постов группы для Paginator.
+
+    Для холодной группы `entry` равен None, и всё читается выборкой.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        self.posts = sharding.scatter(
+            group.posts.select_related('author', 'group')
+        )
+        self.entry = cache.get(cache_key(group.pk))
+        if self.entry is None and is_hot(group.pk):
+            self.entry = load(group.pk)
+
+    def count(self):
+        if self.entry is None:
+            return self.posts.count()
+        return self.entry['count']
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if self.entry is None:
+            return self.posts[index]
+        ids, count = self.entry['ids'], self.entry['count']
+        if len(ids) == count or (index.stop or count) <= len(ids):
+            return hydrate(ids[index])
+        return self.posts[index]
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты в архивную таблицу пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.POSTS_ARCHIVE_AFTER_DAYS,
+            help='Архивировать посты старше указанного числа дней.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.POSTS_ARCHIVE_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        total = archive_posts(
+            options['days'],
+            options['batch_size'],
+            progress=lambda done: self.stdout.write(f'Перенесено: {done}'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Готово, всего {total}.'))
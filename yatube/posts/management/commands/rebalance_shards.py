@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import sharding
+
+
+class Command(BaseCommand):
+    help = 'Переносит посты в шард, который соответствует их автору.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--database', action='append', dest='databases',
+            help='Проверить только эти базы. По умолчанию проверяются все '
+                 'базы из DATABASES, в том числе выведенные из POST_SHARDS.',
+        )
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError('Шардинг выключен: POST_SHARDS пуст.')
+        for alias in options['databases'] or list(settings.DATABASES):
+            posts = sharding.misplaced_posts(alias)
+            moved = sharding.move_posts(alias, posts, options['batch_size'])
+            self.stdout.write(f'{alias}: перенесено {moved}')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts import sitemap
+
+
+class Command(BaseCommand):
+    help = (
+        'Заводит файлы карты сайта для уже существующих постов и сбрасывает '
+        'их кеш. Нужна после первого деплоя карты и смены '
+        'SITEMAP_SHARD_SIZE.'
+    )
+
+    def handle(self, *args, **options):
+        count = sitemap.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Готово, файлов: {count}.'))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import sharding
+from posts.models import RENDERED_FIELDS, ArchivedPost, Post
+from posts.rendering import RENDERER_VERSION
+
+
+class Command(BaseCommand):
+    help = (
+        'Перерисовывает HTML постов, отрендеренных прошлой версией '
+        'рендерера. Пачки пишутся короткими транзакциями, поэтому команду '
+        'можно запускать на работающем сайте.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        targets = [(Post, alias) for alias in sharding.shards() or ['default']]
+        targets.append((ArchivedPost, 'default'))
+        total = 0
+        for model, using in targets:
+            total += self.rerender(model, using, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Готово, всего {total}.'))
+
+    def rerender(self, model, using, batch_size):
+        stale = (
+            model.objects.using(using)
+            .exclude(text_html_version=RENDERER_VERSION)
+            .order_by('pk')
+            .only('text')
+        )
+        last_pk = 0
+        done = 0
+        while True:
+            posts = list(stale.filter(pk__gt=last_pk)[:batch_size])
+            if not posts:
+                return done
+            for post in posts:
+                post.render_text()
+            with transaction.atomic(using=using):
+                model.objects.using(using).bulk_update(posts, RENDERED_FIELDS)
+            last_pk = posts[-1].pk
+            done += len(posts)
+            self.stdout.write(
+                f'{model._meta.db_table}@{using}: перерисовано {done}'
+            )
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:41
+
+from django.db import migrations, models
+
+from core.schema_changes import AddFieldInPlace
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_postscore'),
+    ]
+
+    operations = [
+        AddFieldInPlace(
+            model_name='post',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0010_post_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSummary',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('display_name', models.CharField(max_length=300)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('latest_post', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:48
+
+from django.db import migrations, models
+
+from core.schema_changes import AddFieldInPlace
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_version'),
+    ]
+
+    operations = [
+        AddFieldInPlace(
+            model_name='archivedpost',
+            name='text_html',
+            field=models.TextField(default='', editable=False),
+        ),
+        AddFieldInPlace(
+            model_name='archivedpost',
+            name='text_html_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        AddFieldInPlace(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(default='', editable=False),
+        ),
+        AddFieldInPlace(
+            model_name='post',
+            name='text_html_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,8 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.safestring import mark_safe
+
+from .rendering import RENDERER_VERSION, render_text
 
 User = get_user_model()
 
+RENDERED_FIELDS = ('text_html', 'text_html_version')
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
@@ -13,7 +18,45 @@ class Group(models.Model):
         return self.title
 
 
-class Post(models.Model):
+class RenderedTextModel(models.Model):
+    """HTML текста, отрендеренный при сохранении и хранящийся рядом с ним."""
+    text_html = models.TextField(default='', editable=False)
+    text_html_version = models.PositiveSmallIntegerField(
+        default=0, editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def html(self):
+        if self.text_html_version == RENDERER_VERSION:
+            return mark_safe(self.text_html)
+        return mark_safe(render_text(self.text))
+
+    def render_text(self):
+        self.text_html = render_text(self.text)
+        self.text_html_version = RENDERER_VERSION
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None or 'text' in update_fields:
+            self.render_text()
+            if update_fields is not None:
+                update_fields = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class PostQuerySet(models.QuerySet):
+    def create(self, **kwargs):
+        # В отличие от стандартного create базу выбирает роутер по самому
+        # посту, а не по менеджеру: это нужно для шардинга по автору.
+        obj = self.model(**kwargs)
+        self._for_write = True
+        obj.save(force_insert=True, using=self._db)
+        return obj
+
+
+class Post(RenderedTextModel):
     text = models.TextField()
     pub_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(
@@ -28,9 +71,238 @@ class Post(models.Model):
         on_delete=models.SET_NULL,
         related_name='posts'
     )
+    views = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['-pub_date'], name='post_pub_date_idx'),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_date_idx',
+            ),
+            models.Index(
+                fields=['group', '-pub_date'],
+                name='post_group_date_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.text
+
+
+class ArchivedPost(RenderedTextModel):
+    """Пост старше POSTS_ARCHIVE_AFTER_DAYS, перенесённый из ленты.
+
+    Первичный ключ совпадает с id исходного поста, поэтому ссылки на
+    `/posts/<post_id>/` продолжают работать после архивации.
+    """
+    text = models.TextField()
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts'
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts'
+    )
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='archived_author_date_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.text
+
+
+class PostLocation(models.Model):
+    """Справочник шардов: в какой базе лежит пост с данным id.
+
+    Хранится в базе `default` и заодно выдаёт глобально уникальные id
+    постам, когда посты разнесены по нескольким базам (POST_SHARDS).
+    """
+    shard = models.CharField(max_length=100)
+
+    def __str__(self):
+        return f'{self.pk}@{self.shard}'
+
+
+class PostScore(models.Model):
+    """Рейтинг поста для ленты популярного.
+
+    `score` — логарифм суммы весов событий (создание, просмотры), где вес
+    растёт вдвое каждые TRENDING_HALF_LIFE_HOURS часов. Поэтому старые
+    рейтинги не нужно пересчитывать: свежие события просто весят больше.
+    """
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='score'
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score'], name='score_idx'),
+            models.Index(fields=['group', '-score'], name='group_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.3f}'
+
+
+class ProfileSummary(models.Model):
+    """Сводка для страницы автора, обновляемая при записи постов.
+
+    `post_count` учитывает и архивные посты, `display_name` повторяет
+    `get_full_name()` автора или его username.
+    """
+    author = models.OneToOneField(
+        User,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='profile_summary'
+    )
+    display_name = models.CharField(max_length=300)
+    post_count = models.PositiveIntegerField(default=0)
+    latest_post = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return self.display_name
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'],
+                name='unique_follow',
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='no_self_follow',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.author_id}'
+
+
+class TimelineEntry(models.Model):
+    """Строка ленты подписок: пост автора, на которого подписан `user`.
+
+    Записи создаются при публикации поста (по одной на подписчика), поэтому
+    лента читается одним проходом по индексу `(user, -pub_date)` вместо
+    `author__in` по всем подпискам. Пост может лежать в шарде, поэтому на
+    него ссылается голый `post_id`, а базу поста даёт `author_id`.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    post_id = models.PositiveIntegerField(db_index=True)
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post_id'],
+                name='unique_timeline_post',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date'],
+                name='timeline_user_date_idx',
+            ),
+            models.Index(
+                fields=['user', 'author'],
+                name='timeline_user_author_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}: {self.post_id}'
+
+
+class Comment(models.Model):
+    """Комментарий к посту.
+
+    Комментарии всегда лежат в базе `default`, а пост может быть в шарде
+    или в архиве, поэтому на него ссылается голый `post_id` (id поста
+    при архивации не меняется).
+    """
+    post_id = models.PositiveIntegerField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    text = models.TextField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created', 'pk']
+        indexes = [
+            models.Index(
+                fields=['post_id', 'created'],
+                name='comment_post_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class SitemapShard(models.Model):
+    """Время последнего изменения постов с id из одного файла карты сайта.
+
+    Файл `sitemap-<number>.xml` содержит посты с id от
+    `number * SITEMAP_SHARD_SIZE + 1` до `(number + 1) * SITEMAP_SHARD_SIZE`,
+    а `lastmod` попадает в индекс карты без чтения самих постов.
+    """
+    number = models.PositiveIntegerField(primary_key=True)
+    lastmod = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.number}: {self.lastmod}'
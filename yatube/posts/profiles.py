@@ -0,0 +1,148 @@
+"""Сводка и первая страница профиля автора.
+
+Сводка (ProfileSummary) хранится в базе и обновляется сигналами при
+создании и удалении постов, поэтому страница профиля не считает посты
+автора. Сводка и первая страница профиля лежат в кеше; первую страницу
+сбрасывает любое изменение постов автора или групп, в которых он писал.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from core import object_cache
+from . import sharding
+from .archive import ArchiveFallbackList
+from .models import ArchivedPost, Post, ProfileSummary
+
+
+def display_name(author):
+    return author.get_full_name() or author.username
+
+
+def build_summary(author):
+    """Считает сводку автора с нуля и сохраняет её."""
+    latest = author.posts.values_list('pub_date', flat=True).first()
+    if latest is None:
+        latest = author.archived_posts.values_list(
+            'pub_date', flat=True
+        ).first()
+    summary, _ = ProfileSummary.objects.update_or_create(
+        author=author,
+        defaults={
+            'display_name': display_name(author),
+            'post_count': (
+                author.posts.count() + author.archived_posts.count()
+            ),
+            'latest_post': latest,
+        },
+    )
+    return summary
+
+
+def get_summary(author):
+    """Сводка автора из кеша; недостающая сводка строится при чтении."""
+    return object_cache.get_object(
+        ProfileSummary,
+        loader=lambda pk: (
+            ProfileSummary.objects.filter(pk=pk).first()
+            or build_summary(author)
+        ),
+        pk=author.pk,
+    )
+
+
+def update_summary(author_id, **changes):
+    ProfileSummary.objects.filter(pk=author_id).update(**changes)
+    object_cache.forget(ProfileSummary, 'pk', [author_id])
+    forget_first_page(author_id)
+
+
+def post_added(post):
+    update_summary(
+        post.author_id,
+        post_count=F('post_count') + 1,
+        latest_post=post.pub_date,
+    )
+
+
+def post_removed(post, using):
+    # Архивация и перенос в другой шард удаляют строку поста, но автор
+    # его не теряет.
+    if sharding.is_enabled() and (
+        sharding.shard_for_author(post.author_id) != using
+    ):
+        return
+    if ArchivedPost.objects.filter(pk=post.pk).exists():
+        return
+    summary = ProfileSummary.objects.filter(pk=post.author_id).first()
+    if summary is None:
+        return
+    changes = {'post_count': F('post_count') - 1}
+    if summary.latest_post == post.pub_date:
+        changes['latest_post'] = (
+            Post.objects.using(using)
+            .filter(author_id=post.author_id)
+            .exclude(pk=post.pk)
+            .values_list('pub_date', flat=True)
+            .first()
+        )
+    update_summary(post.author_id, **changes)
+
+
+def author_renamed(author):
+    update_summary(author.pk, display_name=display_name(author))
+
+
+def first_page_key(author_id):
+    return f'profile-first-page:{author_id}'
+
+
+def forget_first_page(author_id):
+    cache.delete(first_page_key(author_id))
+
+
+def group_changed(group):
+    """Сбрасывает первые страницы авторов, у которых есть посты в группе."""
+    querysets = [
+        Post.objects.using(alias).filter(group=group)
+        for alias in sharding.shards() or ['default']
+    ]
+    querysets.append(ArchivedPost.objects.filter(group=group))
+    author_ids = set()
+    for queryset in querysets:
+        author_ids.update(
+            queryset.values_list('author_id', flat=True).distinct()
+        )
+    cache.delete_many([first_page_key(author_id) for author_id in author_ids])
+
+
+class ProfilePosts:
+    """Посты автора для Paginator: число из сводки, первая страница из кеша."""
+
+    def __init__(self, author, summary):
+        self.posts = ArchiveFallbackList(
+            author.posts.select_related('group'),
+            author.archived_posts.select_related('group'),
+        )
+        self.author = author
+        self.summary = summary
+
+    def count(self):
+        return self.summary.post_count
+
+    def first_page(self):
+        key = first_page_key(self.author.pk)
+        page = cache.get(key)
+        if page is None:
+            page = self.posts[:settings.POSTS_ON_PAGE]
+            cache.set(key, page, settings.OBJECT_CACHE_TIMEOUT)
+        return page
+
+    def __getitem__(self, index):
+        if (
+            isinstance(index, slice)
+            and not index.start
+            and index.stop <= settings.POSTS_ON_PAGE
+        ):
+            return self.first_page()[:index.stop]
+        return self.posts[index]
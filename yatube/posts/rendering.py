@@ -0,0 +1,14 @@
+"""Перевод текста поста в HTML.
+
+Текст экранируется, ссылки превращаются в <a rel="nofollow">, а пустые
+строки разбивают текст на абзацы. При изменении правил увеличьте
+RENDERER_VERSION и запустите `manage.py rerender_posts`: до перерисовки
+устаревшие посты рендерятся при чтении.
+"""
+from django.utils.html import linebreaks, urlize
+
+RENDERER_VERSION = 1
+
+
+def render_text(text):
+    return linebreaks(urlize(text, nofollow=True, autoescape=True))
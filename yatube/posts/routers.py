@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+
+from . import sharding
+from .models import Post
+
+User = get_user_model()
+
+
+class PostShardRouter:
+    """Направляет запросы к постам в шард автора.
+
+    Подсказка `instance` приходит либо с самим постом, либо с автором
+    (`author.posts.all()`), поэтому лента профиля читает ровно один шард.
+    Без подсказки решение остаётся за Django (база `default`).
+    """
+
+    def _shard_for_instance(self, instance):
+        if isinstance(instance, Post) and instance.author_id is not None:
+            return sharding.shard_for_author(instance.author_id)
+        if isinstance(instance, User) and instance.pk is not None:
+            return sharding.shard_for_author(instance.pk)
+        return None
+
+    def db_for_read(self, model, **hints):
+        if model is not Post or not sharding.is_enabled():
+            return None
+        return self._shard_for_instance(hints.get('instance'))
+
+    def db_for_write(self, model, **hints):
+        return self.db_for_read(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if sharding.is_enabled():
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,148 @@
+"""Разнесение постов по базам данных по id автора.
+
+Шардинг включается настройкой POST_SHARDS со списком псевдонимов баз из
+DATABASES. Посты автора живут в одной базе, пользователи и группы
+копируются во все базы, а справочник PostLocation в `default` хранит,
+где лежит каждый пост.
+"""
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Post, PostLocation, PostScore
+
+
+def shards():
+    return list(getattr(settings, 'POST_SHARDS', []))
+
+
+def is_enabled():
+    return bool(shards())
+
+
+def shard_for_author(author_id):
+    aliases = shards()
+    return aliases[author_id % len(aliases)]
+
+
+def get_post(post_id):
+    """Находит пост одним запросом к справочнику и одним к шарду."""
+    posts = Post.objects.select_related('author', 'group')
+    if not is_enabled():
+        return posts.filter(pk=post_id).first()
+    location = PostLocation.objects.using('default').filter(
+        pk=post_id
+    ).first()
+    if location is None:
+        return None
+    return posts.using(location.shard).filter(pk=post_id).first()
+
+
+def scatter(queryset):
+    """Возвращает выборку по всем шардам, слитую по дате публикации."""
+    if not is_enabled():
+        return queryset
+    return ShardedList([queryset.using(alias) for alias in shards()])
+
+
+class ShardedList:
+    """Последовательность для Paginator поверх отсортированных выборок.
+
+    Для страницы `[start:stop]` из каждого шарда читается не больше `stop`
+    первых строк, а потоки сливаются через heapq.merge.
+    """
+
+    def __init__(self, querysets):
+        self.querysets = querysets
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        merged = heapq.merge(
+            *(queryset[:stop] for queryset in self.querysets),
+            key=lambda post: post.pub_date,
+            reverse=True,
+        )
+        return list(islice(merged, start, stop))
+
+
+def replicate(instance):
+    """Копирует пользователя или группу во все шарды, кроме `default`."""
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if not field.primary_key
+    }
+    for alias in shards():
+        if alias != 'default':
+            instance.__class__.objects.using(alias).update_or_create(
+                pk=instance.pk, defaults=values,
+            )
+
+
+def unreplicate(instance):
+    for alias in shards():
+        if alias != 'default':
+            instance.__class__.objects.using(alias).filter(
+                pk=instance.pk
+            ).delete()
+
+
+def misplaced_posts(alias):
+    """Посты в базе `alias`, автор которых теперь относится к другой базе."""
+    return [
+        post for post in Post.objects.using(alias).order_by('pk')
+        .only('pk', 'author_id').iterator()
+        if shard_for_author(post.author_id) != alias
+    ]
+
+
+def move_posts(source, posts, batch_size):
+    """Переносит посты в их целевые шарды пачками вместе с рейтингами.
+
+    bulk_create проставляет `pub_date` (auto_now_add) заново, поэтому
+    исходные даты возвращаются отдельным bulk_update: иначе перенесённые
+    посты всплыли бы в начало лент.
+    """
+    moved = 0
+    for start in range(0, len(posts), batch_size):
+        batch = posts[start:start + batch_size]
+        ids = [post.pk for post in batch]
+        rows = list(Post.objects.using(source).filter(pk__in=ids))
+        scores = PostScore.objects.using(source).in_bulk(ids)
+        by_target = {}
+        for row in rows:
+            by_target.setdefault(
+                shard_for_author(row.author_id), []
+            ).append(row)
+        for target, target_rows in by_target.items():
+            pub_dates = [row.pub_date for row in target_rows]
+            with transaction.atomic(using=target):
+                Post.objects.using(target).bulk_create(
+                    target_rows, ignore_conflicts=True,
+                )
+                for row, pub_date in zip(target_rows, pub_dates):
+                    row.pub_date = pub_date
+                Post.objects.using(target).bulk_update(
+                    target_rows, ['pub_date'],
+                )
+                PostScore.objects.using(target).bulk_create(
+                    [
+                        scores[row.pk] for row in target_rows
+                        if row.pk in scores
+                    ],
+                    ignore_conflicts=True,
+                )
+            PostLocation.objects.using('default').filter(
+                pk__in=[row.pk for row in target_rows]
+            ).update(shard=target)
+        with transaction.atomic(using=source):
+            Post.objects.using(source).filter(pk__in=ids).delete()
+        moved += len(rows)
+    return moved
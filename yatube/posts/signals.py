@@ -0,0 +1,181 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import object_cache
+from core.signals import worker_stopping
+from . import (
+    comments, feeds, group_feed, profiles, sharding, sitemap, timeline,
+    trending, view_counter,
+)
+from .models import Comment, Follow, Group, Post, PostLocation
+
+User = get_user_model()
+
+object_cache.register(Post, 'pk')
+object_cache.register(Group, 'slug')
+object_cache.register(User, 'username')
+
+
+@receiver(pre_save, sender=Post)
+def allocate_post_id(sender, instance, **kwargs):
+    """Выдаёт новому посту id из справочника шардов."""
+    if sharding.is_enabled() and instance.pk is None:
+        location = PostLocation.objects.using('default').create(
+            shard=sharding.shard_for_author(instance.author_id)
+        )
+        instance.pk = location.pk
+
+
+@receiver(post_save, sender=Post)
+def track_post_score(sender, instance, using, raw=False, update_fields=None,
+                     **kwargs):
+    if not raw and (update_fields is None or 'group' in update_fields):
+        trending.track_post(instance, using)
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_group(sender, instance, using, raw=False, update_fields=None,
+                       **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is None or 'group' in update_fields:
+        instance._old_group_id = Post.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list('group_id', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+def update_feeds_and_sitemap(sender, instance, created, raw=False, **kwargs):
+    # Должен идти до refresh_group_feeds, который забывает старую группу.
+    if raw:
+        return
+    old_group_id = getattr(instance, '_old_group_id', instance.group_id)
+    feeds.posts_changed(instance.author_id, instance.group_id, old_group_id)
+    if created:
+        sitemap.post_added(instance)
+    else:
+        sitemap.post_changed(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_feeds_and_sitemap(sender, instance, using, **kwargs):
+    feeds.posts_changed(instance.author_id, instance.group_id)
+    sitemap.post_removed(instance, using)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feed(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        feeds.invalidate('author', instance.pk)
+
+
+@receiver(post_save, sender=Group)
+def invalidate_group_feed(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        feeds.invalidate('group', instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def refresh_group_feeds(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_group_id = getattr(instance, '_old_group_id', instance.group_id)
+    if created or old_group_id != instance.group_id:
+        group_feed.refresh(instance.group_id, old_group_id)
+    instance._old_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def update_profile_summary(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        profiles.post_added(instance)
+    else:
+        profiles.forget_first_page(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_profile_summary(sender, instance, using, **kwargs):
+    profiles.post_removed(instance, using)
+
+
+@receiver(post_save, sender=Group)
+def forget_group_profile_pages(sender, instance, created, raw=False,
+                               **kwargs):
+    if not raw and not created:
+        profiles.group_changed(instance)
+
+
+@receiver(post_save, sender=User)
+def rename_profile_summary(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        profiles.author_renamed(instance)
+
+
+@receiver(post_delete, sender=Post)
+def forget_group_feed_post(sender, instance, **kwargs):
+    group_feed.forget(instance)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_to_timelines(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        timeline.fan_out(instance)
+
+
+@receiver(post_delete, sender=Post)
+def forget_timeline_post(sender, instance, using, **kwargs):
+    timeline.forget(instance, using)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        timeline.backfill(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def clear_timeline(sender, instance, **kwargs):
+    timeline.unfollowed(instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        comments.comment_added(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_comments(sender, instance, using, **kwargs):
+    comments.post_removed(instance, using)
+
+
+@receiver(post_delete, sender=Post)
+def forget_post_location(sender, instance, using, **kwargs):
+    # При переносе между шардами запись справочника уже указывает на новую
+    # базу и удалять её не нужно.
+    if sharding.is_enabled():
+        PostLocation.objects.using('default').filter(
+            pk=instance.pk, shard=using
+        ).delete()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Group)
+def replicate_to_shards(sender, instance, using, raw=False, **kwargs):
+    if sharding.is_enabled() and using == 'default' and not raw:
+        sharding.replicate(instance)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Group)
+def unreplicate_from_shards(sender, instance, using, **kwargs):
+    if sharding.is_enabled() and using == 'default':
+        sharding.unreplicate(instance)
+
+
+@receiver(worker_stopping)
+def flush_view_counter(sender, **kwargs):
+    view_counter.flush()
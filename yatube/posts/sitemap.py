@@ -0,0 +1,162 @@
+"""Карта сайта, собираемая по частям.
+
+Посты разбиты на файлы по диапазонам id (SITEMAP_SHARD_SIZE в файле),
+поэтому новый пост всегда попадает в последний файл. Список адресов
+файла лежит в кеше, а создание или удаление поста сбрасывает только
+запись своего файла. Номер файла проверяется по таблице SitemapShard:
+на несуществующие номера отвечаем 404 и ничего не кешируем. Индекс карты
+берёт `lastmod` файлов из той же таблицы, которую обновляют сигналы
+постов. Поисковику больше не нужно обходить ленты страница за страницей
+с глубоким OFFSET.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from . import sharding
+from .models import ArchivedPost, Group, Post, SitemapShard
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def shard_number(post_id):
+    return (post_id - 1) // settings.SITEMAP_SHARD_SIZE
+
+
+def cache_key(number):
+    return f'sitemap-shard:{number}'
+
+
+def post_path(post_id):
+    return reverse('posts:post_detail', kwargs={'post_id': post_id})
+
+
+def load_shard(number):
+    """Собирает адреса постов файла `number` и кладёт их в кеш.
+
+    Для номера, которого нет в SitemapShard, возвращает None.
+    """
+    if not SitemapShard.objects.filter(number=number).exists():
+        return None
+    size = settings.SITEMAP_SHARD_SIZE
+    id_range = (number * size + 1, (number + 1) * size)
+    ids = set(
+        ArchivedPost.objects.filter(pk__range=id_range).order_by()
+        .values_list('pk', flat=True)
+    )
+    for alias in sharding.shards() or ['default']:
+        ids.update(
+            Post.objects.using(alias).filter(pk__range=id_range).order_by()
+            .values_list('pk', flat=True)
+        )
+    paths = [post_path(post_id) for post_id in sorted(ids)]
+    cache.set(cache_key(number), paths, settings.SITEMAP_SHARD_TIMEOUT)
+    return paths
+
+
+def shard_paths(number):
+    paths = cache.get(cache_key(number))
+    if paths is None:
+        paths = load_shard(number)
+    return paths
+
+
+def touch(number):
+    SitemapShard.objects.update_or_create(
+        number=number, defaults={'lastmod': timezone.now()}
+    )
+
+
+def post_added(post):
+    # Запись сбрасывается, а не дописывается: два одновременных
+    # дописывания потеряли бы один из постов.
+    number = shard_number(post.pk)
+    touch(number)
+    cache.delete(cache_key(number))
+
+
+def post_changed(post):
+    touch(shard_number(post.pk))
+
+
+def post_removed(post, using):
+    """Убирает удалённый пост; архивный и перенесённый пост остаётся."""
+    if sharding.is_enabled() and (
+        sharding.shard_for_author(post.author_id) != using
+    ):
+        return
+    if ArchivedPost.objects.filter(pk=post.pk).exists():
+        return
+    number = shard_number(post.pk)
+    touch(number)
+    cache.delete(cache_key(number))
+
+
+def rebuild():
+    """Заводит записи SitemapShard для всех постов и сбрасывает кеш файлов.
+
+    Нужна один раз для постов, созданных до появления карты сайта, и
+    после смены SITEMAP_SHARD_SIZE. Возвращает число файлов.
+    """
+    last_ids = [
+        ArchivedPost.objects.order_by('-pk').values_list('pk', flat=True)
+        .first()
+    ]
+    for alias in sharding.shards() or ['default']:
+        last_ids.append(
+            Post.objects.using(alias).order_by('-pk')
+            .values_list('pk', flat=True).first()
+        )
+    last_id = max(filter(None, last_ids), default=0)
+    count = shard_number(last_id) + 1 if last_id else 0
+    SitemapShard.objects.filter(number__gte=count).delete()
+    for number in range(count):
+        cache.delete(cache_key(number))
+        touch(number)
+    return count
+
+
+def render_urlset(base_url, paths):
+    urls = ''.join(
+        f'<url><loc>{escape(base_url + path)}</loc></url>\n' for path in paths
+    )
+    return f'{XML_HEADER}<urlset xmlns="{XMLNS}">\n{urls}</urlset>\n'
+
+
+def render_shard(base_url, number):
+    """XML файла карты или None, если такого файла нет."""
+    paths = shard_paths(number)
+    if paths is None:
+        return None
+    return render_urlset(base_url, paths)
+
+
+def render_pages(base_url):
+    """Главная и ленты групп: их немного, и они не меняются по id."""
+    paths = [reverse('posts:index')] + [
+        reverse('posts:group_list', kwargs={'slug': slug})
+        for slug in Group.objects.values_list('slug', flat=True)
+    ]
+    return render_urlset(base_url, paths)
+
+
+def render_index(base_url):
+    entries = [
+        f'<sitemap><loc>{escape(base_url + reverse("posts:sitemap_pages"))}'
+        '</loc></sitemap>\n'
+    ]
+    for number, lastmod in SitemapShard.objects.order_by(
+        'number'
+    ).values_list('number', 'lastmod'):
+        path = reverse('posts:sitemap_shard', kwargs={'number': number})
+        entries.append(
+            f'<sitemap><loc>{escape(base_url + path)}</loc>'
+            f'<lastmod>{lastmod.isoformat()}</lastmod></sitemap>\n'
+        )
+    return (
+        f'{XML_HEADER}<sitemapindex xmlns="{XMLNS}">\n'
+        f'{"".join(entries)}</sitemapindex>\n'
+    )
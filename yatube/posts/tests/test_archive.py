@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.archive import archive_posts
+from posts.models import ArchivedPost, Post
+
+User = get_user_model()
+
+
+class ArchiveTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.old_post = Post.objects.create(author=cls.user, text='Старый')
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        cls.new_post = Post.objects.create(author=cls.user, text='Новый')
+
+    def test_old_posts_moved_in_batches(self):
+        """Старые посты переносятся в архив, свежие остаются в ленте."""
+        self.assertEqual(archive_posts(days=365, batch_size=1), 1)
+        self.assertFalse(Post.objects.filter(pk=self.old_post.pk).exists())
+        self.assertTrue(
+            ArchivedPost.objects.filter(pk=self.old_post.pk).exists()
+        )
+        self.assertEqual(archive_posts(days=365, batch_size=1), 0)
+
+    def test_archived_post_still_available(self):
+        """Страницы поста и профиля показывают архивные посты."""
+        archive_posts(days=365, batch_size=10)
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.old_post.pk})
+        )
+        self.assertEqual(response.context['post'].text, 'Старый')
+        self.assertEqual(response.context['post_count'], 2)
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'})
+        )
+        texts = [post.text for post in response.context['page_obj']]
+        self.assertEqual(texts, ['Новый', 'Старый'])
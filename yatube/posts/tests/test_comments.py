@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import comments
+from posts.archive import archive_posts
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(COMMENTS_ON_PAGE=3)
+class CommentTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(author=self.user, text='Пост')
+        self.url = reverse('posts:post_detail', args=[self.post.pk])
+        self.client.force_login(self.user)
+
+    def comment(self, text):
+        return self.client.post(
+            reverse('posts:add_comment', args=[self.post.pk]),
+            {'text': text},
+        )
+
+    def test_add_comment_updates_count(self):
+        response = self.comment('Первый')
+        self.assertRedirects(response, self.url)
+        self.comment('Второй')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Комментарии: 2')
+        self.assertContains(response, 'Первый')
+
+    def test_anonymous_cannot_comment(self):
+        self.client.logout()
+        self.comment('Аноним')
+        self.assertFalse(Comment.objects.exists())
+
+    def test_keyset_pages(self):
+        """Курсор отдаёт следующие комментарии без пропусков и повторов."""
+        # Одинаковое время создания не ломает порядок страниц.
+        created = timezone.now()
+        Comment.objects.bulk_create(
+            Comment(
+                post_id=self.post.pk, author=self.user, text=f'Ком {i}',
+                created=created + timedelta(seconds=i // 2),
+            )
+            for i in range(8)
+        )
+        seen, cursor = [], None
+        while True:
+            page, cursor = comments.comment_page(self.post.pk, cursor)
+            seen += [comment.text for comment in page]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f'Ком {i}' for i in range(8)])
+
+    def test_load_more_fragment(self):
+        for i in range(5):
+            self.comment(f'Ком {i}')
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['comments']), 3)
+        cursor = response.context['next_cursor']
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('posts:post_comments', args=[self.post.pk]),
+                {'after': cursor},
+            )
+        self.assertContains(response, 'Ком 4')
+        self.assertNotContains(response, 'Ком 2')
+        self.assertNotContains(response, 'Показать ещё')
+
+    def test_bad_cursor_is_404(self):
+        for cursor in (
+            'мусор', '9' * 30 + '.1', '-' + '9' * 30 + '.1', '1.' + '9' * 30,
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    reverse('posts:post_comments', args=[self.post.pk]),
+                    {'after': cursor},
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_deleted_post_loses_comments(self):
+        self.comment('Пропаду')
+        self.post.delete()
+        self.assertFalse(Comment.objects.exists())
+
+    def test_archived_post_keeps_comments(self):
+        self.comment('Останусь')
+        Post.objects.filter(pk=self.post.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        archive_posts(days=7, batch_size=10)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Останусь')
+        self.assertContains(response, 'Комментарии: 1')
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.template import engines
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.context_processors.year import year
+
+
+class ContextProcessorTest(TestCase):
+    def test_year_is_lazy(self):
+        """Год вычисляется при выводе в шаблоне, а не в процессоре."""
+        value = year(RequestFactory().get('/'))['year']
+        self.assertTrue(callable(value))
+        self.assertContains(
+            self.client.get('/about/author/'), f'© {datetime.now().year}'
+        )
+
+    def test_no_header_by_default(self):
+        response = self.client.get('/about/author/')
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(CONTEXT_PROCESSOR_PROFILING=True)
+    def test_server_timing_header(self):
+        """Время каждого контекст-процессора уходит в Server-Timing."""
+        for backend in engines.all():
+            # Обёртки замера снимаются после теста.
+            self.addCleanup(
+                backend.engine.__dict__.pop,
+                'template_context_processors',
+                None,
+            )
+        response = self.client.get('/about/author/')
+        header = response['Server-Timing']
+        self.assertIn('cp;desc="core.context_processors.year.year";', header)
+        self.assertIn(
+            'cp;desc="django.contrib.auth.context_processors.auth";', header
+        )
+        self.assertIn('cp-total;dur=', header)
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostEditingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Исходный')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_edit', kwargs={'post_id': self.post.pk})
+
+    def edit(self, **data):
+        return self.client.post(self.url, data={'group': '', **data})
+
+    def test_unchanged_form_skips_write(self):
+        """Неизменённая форма не пишет в базу."""
+        self.edit(text='Исходный', version=0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.version, 0)
+
+    def test_changed_fields_written_with_new_version(self):
+        """Правка записывает изменённые поля и увеличивает версию."""
+        response = self.edit(text='Новый', group=self.group.pk, version=0)
+        self.assertEqual(response.status_code, 302)
+        self.post.refresh_from_db()
+        self.assertEqual(
+            (self.post.text, self.post.group, self.post.version),
+            ('Новый', self.group, 1),
+        )
+
+    def test_stale_version_conflicts(self):
+        """Правка устаревшей версии возвращает 409 и ничего не меняет."""
+        self.edit(text='Первая правка', version=0)
+        response = self.edit(text='Вторая правка', version=0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.context['version'], 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Первая правка')
+
+    def test_conflict_keeps_submitted_text(self):
+        """В ответе 409 остаётся введённый текст и видна новая версия."""
+        self.edit(text='Первая правка', version=0)
+        response = self.edit(text='Вторая правка', version=0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.context['form']['text'].value(),
+                         'Вторая правка')
+        self.assertContains(response, 'Вторая правка', status_code=409)
+        self.assertContains(response, 'Первая правка', status_code=409)
+        self.assertContains(
+            response, 'name="version" value="1"', status_code=409
+        )
+
+    def test_edit_form_carries_version(self):
+        """Форма правки передаёт текущую версию поста."""
+        response = self.client.get(self.url)
+        self.assertContains(response, 'name="version" value="0"')
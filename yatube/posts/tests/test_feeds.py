@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class AtomFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(
+            username='auth', first_name='Лев', last_name='Толстой'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=self.user, text='Первый пост', group=self.group
+        )
+        self.group_url = reverse(
+            'posts:group_atom', kwargs={'slug': 'test_slug'}
+        )
+        self.author_url = reverse(
+            'posts:author_atom', kwargs={'username': 'auth'}
+        )
+
+    def test_feeds_contain_rendered_posts(self):
+        for url, title in (
+            (self.group_url, 'Тестовая группа'),
+            (self.author_url, 'Лев Толстой'),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(
+                    response['Content-Type'],
+                    'application/atom+xml; charset=utf-8',
+                )
+                self.assertContains(response, f'<title>{title}</title>')
+                self.assertContains(response, '&lt;p&gt;Первый пост&lt;/p&gt;')
+                self.assertContains(
+                    response, f'http://testserver/posts/{self.post.pk}/'
+                )
+
+    def test_unchanged_feed_served_from_cache(self):
+        self.client.get(self.group_url)
+        with self.assertNumQueries(0):
+            self.client.get(self.group_url)
+
+    def test_query_string_not_cached_in_self_link(self):
+        self.client.get(self.group_url, {'utm': 'x'})
+        response = self.client.get(self.group_url)
+        self.assertContains(
+            response, f'href="http://testserver{self.group_url}" rel="self"'
+        )
+        self.assertNotContains(response, 'utm')
+
+    def test_post_changes_regenerate_feeds(self):
+        self.client.get(self.group_url)
+        self.client.get(self.author_url)
+        Post.objects.create(
+            author=self.user, text='Второй пост', group=self.group
+        )
+        self.assertContains(self.client.get(self.group_url), 'Второй пост')
+        self.assertContains(self.client.get(self.author_url), 'Второй пост')
+        self.post.delete()
+        self.assertNotContains(
+            self.client.get(self.group_url), 'Первый пост'
+        )
+
+    def test_moving_post_updates_old_group(self):
+        self.client.get(self.group_url)
+        self.post.group = None
+        self.post.save()
+        self.assertNotContains(
+            self.client.get(self.group_url), 'Первый пост'
+        )
+
+    def test_rename_regenerates_author_feed(self):
+        self.client.get(self.author_url)
+        self.user.first_name = 'Алексей'
+        self.user.save()
+        self.assertContains(
+            self.client.get(self.author_url), 'Алексей Толстой'
+        )
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Post, TimelineEntry
+
+User = get_user_model()
+
+
+class FollowTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='author')
+        cls.other = User.objects.create(username='other')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.reader)
+
+    def follow(self, author):
+        return self.client.get(
+            reverse('posts:profile_follow', kwargs={'username': author})
+        )
+
+    def feed(self):
+        response = self.client.get(reverse('posts:follow_index'))
+        return [post.text for post in response.context['page_obj']]
+
+    def test_follow_and_unfollow(self):
+        """Подписка создаётся один раз и снимается отпиской."""
+        response = self.follow('author')
+        self.assertRedirects(
+            response,
+            reverse('posts:profile', kwargs={'username': 'author'})
+        )
+        self.follow('author')
+        self.assertEqual(
+            Follow.objects.filter(user=self.reader, author=self.author)
+            .count(),
+            1
+        )
+        self.client.get(
+            reverse('posts:profile_unfollow', kwargs={'username': 'author'})
+        )
+        self.assertFalse(Follow.objects.filter(user=self.reader).exists())
+
+    def test_cannot_follow_self(self):
+        self.follow('reader')
+        self.assertFalse(Follow.objects.exists())
+        with self.assertRaises(IntegrityError):
+            Follow.objects.create(user=self.reader, author=self.reader)
+
+    def test_new_post_reaches_followers_only(self):
+        """Новый пост появляется только в лентах подписчиков автора."""
+        self.follow('author')
+        Post.objects.create(author=self.author, text='Для подписчиков')
+        Post.objects.create(author=self.other, text='Чужой пост')
+        self.assertEqual(self.feed(), ['Для подписчиков'])
+        self.client.force_login(self.other)
+        self.assertEqual(self.feed(), [])
+
+    @override_settings(TIMELINE_BACKFILL=2)
+    def test_follow_backfills_and_unfollow_clears(self):
+        """Подписка добавляет последние посты автора, отписка убирает."""
+        for i in range(3):
+            Post.objects.create(author=self.author, text=f'Пост {i}')
+        self.follow('author')
+        self.assertEqual(self.feed(), ['Пост 2', 'Пост 1'])
+        Follow.objects.filter(user=self.reader).delete()
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_deleted_post_leaves_feed(self):
+        self.follow('author')
+        post = Post.objects.create(author=self.author, text='Удалю')
+        post.delete()
+        self.assertEqual(self.feed(), [])
+
+    def test_feed_page_queries(self):
+        """Страница ленты не зависит от числа подписок."""
+        for i in range(20):
+            author = User.objects.create(username=f'author-{i}')
+            Follow.objects.create(user=self.reader, author=author)
+            Post.objects.create(author=author, text=author.username)
+        self.feed()
+        # Сессия, пользователь, count ленты, строки ленты, посты.
+        with self.assertNumQueries(5):
+            self.assertEqual(len(self.feed()), 10)
+
+    def test_profile_shows_follow_button(self):
+        url = reverse('posts:profile', kwargs={'username': 'author'})
+        self.assertContains(self.client.get(url), 'Подписаться')
+        self.follow('author')
+        self.assertContains(self.client.get(url), 'Отписаться')
+
+    def test_follow_index_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 302)
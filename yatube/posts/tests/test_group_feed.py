@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts import group_feed
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(
+    POSTS_ON_PAGE=2, GROUP_FEED_CACHED_PAGES=2, GROUP_FEED_HOT_HITS=1
+)
+class GroupFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other_slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}', group=cls.group)
+            for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def feed(self, start=0, stop=2):
+        return [
+            post.text for post in group_feed.GroupFeed(self.group)[start:stop]
+        ]
+
+    def test_first_pages_read_by_ids(self):
+        """Первые страницы собираются одним запросом по id."""
+        expected = [
+            post.text for post in Post.objects.filter(group=self.group)[:4]
+        ]
+        self.feed()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.feed(2, 4), expected[2:4])
+
+    @override_settings(GROUP_FEED_HOT_HITS=3)
+    def test_cold_group_not_cached(self):
+        """Редко открываемая группа читается выборкой и не кешируется."""
+        key = group_feed.cache_key(self.group.pk)
+        for _ in range(2):
+            self.assertEqual(self.feed(), ['Пост 4', 'Пост 3'])
+            self.assertIsNone(cache.get(key))
+        self.feed()
+        self.assertIsNotNone(cache.get(key))
+
+    def test_empty_group_cached(self):
+        """Пустая лента горячей группы тоже берётся из кеша."""
+        group_feed.GroupFeed(self.other_group)
+        with self.assertNumQueries(0):
+            self.assertEqual(group_feed.GroupFeed(self.other_group).count(), 0)
+
+    def test_later_pages_use_query(self):
+        """Страницы за пределами кеша читаются обычной выборкой."""
+        feed = group_feed.GroupFeed(self.group)
+        self.assertEqual(feed.count(), 5)
+        self.assertEqual(len(feed[4:6]), 1)
+
+    def test_new_post_refreshes_cached_feed(self):
+        """Новый пост сразу попадает в закешированную ленту."""
+        group_feed.GroupFeed(self.group)
+        Post.objects.create(author=self.user, text='Новый', group=self.group)
+        feed = group_feed.GroupFeed(self.group)
+        self.assertEqual(feed.count(), 6)
+        self.assertIn('Новый', [post.text for post in feed[:6]])
+
+    def test_move_and_delete_refresh_feeds(self):
+        """Перенос и удаление поста обновляют ленты обеих групп."""
+        group_feed.GroupFeed(self.group)
+        group_feed.GroupFeed(self.other_group)
+        post = Post.objects.filter(group=self.group).first()
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(group_feed.GroupFeed(self.group).count(), 4)
+        self.assertEqual(group_feed.GroupFeed(self.other_group)[:1], [post])
+        post.delete()
+        self.assertEqual(group_feed.GroupFeed(self.other_group).count(), 0)
+
+    @override_settings(POSTS_ON_PAGE=10, GROUP_FEED_CACHED_PAGES=1)
+    def test_group_page_uses_feed(self):
+        """Страница группы постранично показывает посты из кеша."""
+        url = reverse('posts:group_list', kwargs={'slug': 'test_slug'})
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['page_obj']), 5)
+        self.assertNotIn('posts', response.context)
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import TestCase, override_settings
+
+from users.hashers import TunedPBKDF2PasswordHasher
+
+User = get_user_model()
+
+
+class PasswordHasherTest(TestCase):
+    def test_old_hash_upgraded_on_login(self):
+        """При входе старый хеш пересчитывается с новым числом итераций."""
+        old_hasher = PBKDF2PasswordHasher()
+        user = User.objects.create(
+            username='auth',
+            password=old_hasher.encode(
+                'Sup3r-pass', old_hasher.salt(), iterations=100000,
+            ),
+        )
+        self.assertTrue(
+            self.client.login(username='auth', password='Sup3r-pass')
+        )
+        user.refresh_from_db()
+        iterations = int(user.password.split('$')[1])
+        self.assertEqual(iterations, TunedPBKDF2PasswordHasher().iterations)
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=200000)
+    def test_setting_read_when_hashing(self):
+        encoded = TunedPBKDF2PasswordHasher().encode('Sup3r-pass', 'salt')
+        self.assertEqual(int(encoded.split('$')[1]), 200000)
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_never_below_django_default(self):
+        """Слишком малое значение настройки не ослабляет хеши."""
+        self.assertEqual(
+            TunedPBKDF2PasswordHasher().iterations,
+            PBKDF2PasswordHasher.iterations,
+        )
+
+    @override_settings(AUTH_PASSWORD_VALIDATORS=[{
+        'NAME': 'users.validators.CommonPasswordValidator',
+    }])
+    def test_common_password_rejected(self):
+        """Распространённый пароль не проходит регистрацию."""
+        response = self.client.post('/auth/signup/', {
+            'username': 'new_user',
+            'password1': 'password123',
+            'password2': 'password123',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(User.objects.filter(username='new_user').exists())
@@ -0,0 +1,40 @@
+import importlib
+import os
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import clear_url_caches, get_resolver, reverse
+
+from yatube import urls
+
+
+class LazyUrlconfsTest(SimpleTestCase):
+    def test_admin_app_follows_environment(self):
+        """YATUBE_LAZY_URLCONFS=1 включает флаг и SimpleAdminConfig."""
+        with mock.patch.dict(sys.modules), mock.patch.dict(
+            os.environ, {'YATUBE_LAZY_URLCONFS': '1'}
+        ):
+            sys.modules.pop('yatube.settings.base', None)
+            base = importlib.import_module('yatube.settings.base')
+        self.assertTrue(base.LAZY_URLCONFS)
+        self.assertIn(
+            'django.contrib.admin.apps.SimpleAdminConfig', base.INSTALLED_APPS
+        )
+        self.assertNotIn('django.contrib.admin', base.INSTALLED_APPS)
+
+    @override_settings(LAZY_URLCONFS=True)
+    def test_sections_imported_on_first_request(self):
+        """URL админки импортируются не с URLconf, а первым запросом."""
+        self.addCleanup(clear_url_caches)
+        self.addCleanup(importlib.reload, urls)
+        sys.modules.pop('yatube.admin_urls', None)
+        importlib.reload(urls)
+        clear_url_caches()
+        get_resolver().url_patterns
+        self.assertNotIn('yatube.admin_urls', sys.modules)
+        self.assertEqual(self.client.get('/admin/login/').status_code, 200)
+        self.assertIn('yatube.admin_urls', sys.modules)
+        self.assertEqual(
+            self.client.get(reverse('about:author')).status_code, 200
+        )
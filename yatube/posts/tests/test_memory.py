@@ -0,0 +1,61 @@
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.checks import run_checks
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+
+from core.memory import MemoryTracker
+from core.middleware import MemoryProfilerMiddleware
+from core.views import memory_report
+
+User = get_user_model()
+
+
+@override_settings(MEMORY_PROFILING=True)
+class MemoryProfilingTest(TestCase):
+    def setUp(self):
+        self.addCleanup(tracemalloc.stop)
+        self.factory = RequestFactory()
+
+    def allocate(self, request):
+        request.payload = bytearray(100_000)
+        return HttpResponse()
+
+    def test_delta_recorded_per_view(self):
+        """Прирост памяти за запрос записывается под именем вьюхи."""
+        middleware = MemoryProfilerMiddleware(self.allocate)
+        request = self.factory.get('/')
+        request.resolver_match = resolve('/')
+        middleware(request)
+        stats = middleware.tracker.views['posts:index']
+        self.assertEqual(stats.requests, 1)
+        self.assertGreaterEqual(stats.largest, 100_000)
+
+    def test_report_for_staff_only(self):
+        """Отчёт о памяти доступен только персоналу."""
+        MemoryTracker().start()
+        request = self.factory.get('/debug/memory/')
+        request.user = User.objects.create(username='staff', is_staff=True)
+        response = memory_report(request)
+        self.assertContains(response, 'Крупнейшие выделения')
+        request.user = User.objects.create(username='guest')
+        self.assertEqual(memory_report(request).status_code, 302)
+
+    def test_report_validates_top(self):
+        """Нечисловой top даёт 400, слишком большой обрезается."""
+        MemoryTracker().start()
+        user = User.objects.create(username='staff', is_staff=True)
+        request = self.factory.get('/debug/memory/', {'top': 'x'})
+        request.user = user
+        self.assertEqual(memory_report(request).status_code, 400)
+        request = self.factory.get('/debug/memory/', {'top': '10000000'})
+        request.user = user
+        self.assertContains(memory_report(request), '(топ 100)')
+
+    @override_settings(DEBUG=True)
+    def test_deploy_check_warns_about_query_log(self):
+        """Проверка деплоя предупреждает о журнале запросов при DEBUG."""
+        messages = run_checks(include_deployment_checks=True)
+        self.assertIn('core.W001', [message.id for message in messages])
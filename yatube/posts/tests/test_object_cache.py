@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from core import object_cache
+from posts.models import Group
+
+User = get_user_model()
+
+
+class ObjectCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_second_lookup_served_from_cache(self):
+        """Повторный запрос объекта не обращается к базе."""
+        object_cache.get_object(Group, slug='test_slug')
+        with self.assertNumQueries(0):
+            group = object_cache.get_object(Group, slug='test_slug')
+        self.assertEqual(group, self.group)
+
+    def test_save_invalidates_cache(self):
+        """Сохранение объекта сбрасывает его запись в кеше."""
+        object_cache.get_object(Group, slug='test_slug')
+        self.group.title = 'Новое название'
+        self.group.save()
+        group = object_cache.get_object(Group, slug='test_slug')
+        self.assertEqual(group.title, 'Новое название')
+
+    def test_rename_invalidates_old_key(self):
+        """После смены slug по старому адресу объект больше не находится."""
+        group = Group.objects.create(
+            title='Старая', slug='old', description=''
+        )
+        object_cache.get_object(Group, slug='old')
+        group.slug = 'renamed'
+        group.save()
+        self.assertIsNone(object_cache.get_object(Group, slug='old'))
+        self.assertEqual(object_cache.get_object(Group, slug='renamed'), group)
+
+    def test_keys_safe_for_memcached(self):
+        """Значение поля попадает в ключ хешем: без пробелов и кириллицы."""
+        key = object_cache.cache_key(User, 'username', 'имя с пробелом')
+        self.assertTrue(key.isascii())
+        self.assertNotIn(' ', key)
+        self.assertLessEqual(len(key), 250)
+
+    def test_missing_object_cached(self):
+        """Отсутствующий объект тоже кешируется до его создания."""
+        self.assertIsNone(object_cache.get_object(Group, slug='new'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(object_cache.get_object(Group, slug='new'))
+        Group.objects.create(title='Новая', slug='new', description='')
+        self.assertIsNotNone(object_cache.get_object(Group, slug='new'))
@@ -0,0 +1,145 @@
+import socketserver
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import OutboxSender
+from core.models import OutboxMessage
+
+User = get_user_model()
+
+
+class SMTPStandIn(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-сервер: принимает письма и складывает их в список."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost')
+        while True:
+            line = self.rfile.readline().decode()
+            if not line:
+                return
+            verb = line.split(' ', 1)[0].strip().upper()
+            if verb == 'RCPT' and 'refused' in line:
+                self.reply('550 No such user')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in iter(self.rfile.readline, b'.\r\n'):
+                    data.append(data_line)
+                self.server.messages.append(b''.join(data))
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class OutboxTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.smtp = socketserver.ThreadingTCPServer(
+            ('127.0.0.1', 0), SMTPStandIn
+        )
+        cls.smtp.daemon_threads = True
+        threading.Thread(target=cls.smtp.serve_forever, daemon=True).start()
+        cls.smtp_settings = override_settings(
+            EMAIL_BACKEND='core.mail.OutboxBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=cls.smtp.server_address[1],
+        )
+        cls.smtp_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.smtp_settings.disable()
+        cls.smtp.shutdown()
+        cls.smtp.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.smtp.connections = 0
+        self.smtp.messages = []
+
+    def send_outbox(self):
+        call_command('send_outbox', once=True, rate=1000, stdout=StringIO())
+
+    def test_password_reset_only_queues(self):
+        """Сброс пароля ставит письмо в очередь, не подключаясь к SMTP."""
+        User.objects.create_user('auth', 'auth@example.com', 'password')
+        self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'auth@example.com'},
+        )
+        self.assertEqual(self.smtp.connections, 0)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipient_list, ['auth@example.com'])
+        self.send_outbox()
+        self.assertEqual(len(self.smtp.messages), 1)
+
+    def test_batch_sent_over_one_connection(self):
+        """Пачка писем уходит через одно SMTP-соединение."""
+        for number in range(3):
+            mail.send_mail('Тема', 'Текст', None, [f'u{number}@example.com'])
+        self.send_outbox()
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertFalse(OutboxMessage.objects.filter(sent=None).exists())
+
+    def test_refused_recipient_not_retried(self):
+        """Отвергнутый адрес больше не пытаются отправить."""
+        mail.send_mail('Тема', 'Текст', None, ['refused@example.com'])
+        self.send_outbox()
+        message = OutboxMessage.objects.get()
+        self.assertIsNone(message.sent)
+        self.assertEqual(message.attempts, 5)
+
+    def test_failed_delivery_retried_later(self):
+        """При недоступном сервере письмо откладывается на потом."""
+        mail.send_mail('Тема', 'Текст', None, ['auth@example.com'])
+        with override_settings(EMAIL_PORT=1):
+            self.send_outbox()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt, timezone.now())
+        OutboxMessage.objects.update(next_attempt=timezone.now())
+        self.send_outbox()
+        self.assertIsNotNone(OutboxMessage.objects.get().sent)
+
+    def test_delivered_messages_saved_before_crash(self):
+        """Письма, ушедшие до неожиданной ошибки, уже отмечены в базе."""
+        for number in range(3):
+            mail.send_mail('Тема', 'Текст', None, [f'u{number}@example.com'])
+        sender = OutboxSender(rate=1000)
+        self.addCleanup(sender.close)
+        deliver = sender.deliver
+        calls = []
+
+        def crash_on_second(row):
+            calls.append(row.pk)
+            if len(calls) == 2:
+                raise UnicodeEncodeError('ascii', '', 0, 1, 'bad')
+            deliver(row)
+
+        with mock.patch.object(sender, 'deliver', crash_on_second):
+            with self.assertRaises(UnicodeEncodeError):
+                sender.send_batch()
+        first, second = (
+            OutboxMessage.objects.get(pk=pk) for pk in calls
+        )
+        self.assertIsNotNone(first.sent)
+        self.assertIsNone(second.sent)
+        self.assertEqual(second.attempts, 1)
+        self.assertIn('UnicodeEncodeError', second.last_error)
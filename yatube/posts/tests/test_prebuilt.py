@@ -0,0 +1,61 @@
+import io
+import tempfile
+
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import PrebuiltPageMiddleware
+
+
+class PrebuiltPageTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings = override_settings(PREBUILT_PAGES_DIR=self.directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command('build_static_pages', stdout=io.StringIO())
+        self.middleware = PrebuiltPageMiddleware(self.fail_dynamic)
+        self.factory = RequestFactory()
+
+    def fail_dynamic(self, request):
+        self.fail('Запрос ушёл в обычную обработку')
+
+    def test_page_served_from_memory(self):
+        """Анонимный посетитель получает собранную страницу с ETag."""
+        response = self.middleware(self.factory.get('/about/author/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Привет, я автор', response.content.decode())
+        etag = response['ETag']
+        response = self.middleware(
+            self.factory.get('/about/author/', HTTP_IF_NONE_MATCH=etag)
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_lists_and_weak_tags(self):
+        """304 отдаётся на список ETag, '*' и слабый W/-тег."""
+        etag = self.middleware(self.factory.get('/about/author/'))['ETag']
+        for header in ('"other", ' + etag, '*', 'W/' + etag):
+            with self.subTest(header=header):
+                response = self.middleware(self.factory.get(
+                    '/about/author/', HTTP_IF_NONE_MATCH=header
+                ))
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+        response = self.middleware(
+            self.factory.get('/about/author/', HTTP_IF_NONE_MATCH='"other"')
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_security_headers_on_prebuilt_page(self):
+        """Собранная страница проходит через XFrameOptionsMiddleware."""
+        response = self.client.get('/about/author/')
+        self.assertIn('ETag', response)
+        self.assertEqual(response['X-Frame-Options'], 'SAMEORIGIN')
+
+    def test_session_request_rendered_dynamically(self):
+        """С cookie сессии страница рендерится обычным путём."""
+        middleware = PrebuiltPageMiddleware(lambda request: 'dynamic')
+        request = self.factory.get('/about/author/')
+        request.COOKIES['sessionid'] = 'key'
+        self.assertEqual(middleware(request), 'dynamic')
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import profiles
+from posts.archive import archive_posts
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ProfileSummaryTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(
+            username='auth', first_name='Лев', last_name='Толстой',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Первый')
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:profile', kwargs={'username': 'auth'})
+
+    def summary(self):
+        return profiles.get_summary(self.user)
+
+    def test_summary_follows_writes(self):
+        """Сводка обновляется при создании и удалении постов."""
+        self.assertEqual(self.summary().post_count, 1)
+        post = Post.objects.create(author=self.user, text='Второй')
+        summary = self.summary()
+        self.assertEqual(summary.post_count, 2)
+        self.assertEqual(summary.latest_post, post.pub_date)
+        post.delete()
+        summary = self.summary()
+        self.assertEqual(summary.post_count, 1)
+        self.assertEqual(summary.latest_post, self.post.pub_date)
+
+    def test_archiving_keeps_count(self):
+        """Перенос в архив не уменьшает число постов автора."""
+        self.summary()
+        Post.objects.filter(pk=self.post.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        archive_posts(days=7, batch_size=10)
+        self.assertEqual(self.summary().post_count, 1)
+
+    def test_rename_updates_display_name(self):
+        """Имя в сводке меняется вместе с именем автора."""
+        self.assertEqual(self.summary().display_name, 'Лев Толстой')
+        self.user.first_name = 'Алексей'
+        self.user.save()
+        self.assertEqual(self.summary().display_name, 'Алексей Толстой')
+
+    def test_profile_served_from_cache(self):
+        """Повторный показ профиля не обращается к базе."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пост {i}') for i in range(30)
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['paginator'].count, 31)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertContains(response, 'Автор: Лев Толстой')
+
+    def test_new_post_resets_first_page(self):
+        """Новый пост сразу виден на первой странице профиля."""
+        self.client.get(self.url)
+        Post.objects.create(author=self.user, text='Свежий')
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['page_obj'][0].text, 'Свежий')
+
+    def test_group_rename_resets_first_page(self):
+        """Новое название группы сразу видно на первой странице профиля."""
+        group = Group.objects.create(
+            title='Старая', slug='renamed', description='Группа'
+        )
+        Post.objects.create(author=self.user, text='В группе', group=group)
+        self.client.get(self.url)
+        group.title = 'Новая'
+        group.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['page_obj'][0].group.title, 'Новая')
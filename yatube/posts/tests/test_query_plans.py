@@ -0,0 +1,130 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from core.query_plans import capture_queries, plan_problems
+from posts import profiles, sitemap, urls
+from posts.models import Comment, Follow, Group, Post, PostScore
+
+User = get_user_model()
+
+READER_URLS = {
+    'posts:follow_index', 'posts:profile_follow', 'posts:profile_unfollow',
+}
+
+# Имя URL → (метод, нужен ли вход, число запросов без прогретого кеша).
+# Новый URL в posts.urls нужно добавить сюда, иначе тест упадёт. В
+# post_detail входит запись просмотров: в тестах буфер сбрасывается сразу.
+EXPECTED = {
+    'posts:index': ('get', False, 2),
+    'posts:trending': ('get', False, 1),
+    'posts:group_list': ('get', False, 3),
+    'posts:group_trending': ('get', False, 2),
+    'posts:follow_index': ('get', True, 5),
+    'posts:profile': ('get', False, 7),
+    'posts:profile_follow': ('get', True, 9),
+    'posts:profile_unfollow': ('get', True, 6),
+    'posts:post_detail': ('get', False, 12),
+    'posts:add_comment': ('post', True, 5),
+    'posts:post_comments': ('get', False, 1),
+    'posts:post_create': ('get', True, 2),
+    'posts:post_edit': ('get', True, 3),
+    'posts:group_atom': ('get', False, 2),
+    'posts:author_atom': ('get', False, 4),
+    'posts:sitemap_index': ('get', False, 1),
+    'posts:sitemap_pages': ('get', False, 1),
+    'posts:sitemap_shard': ('get', False, 3),
+}
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+class QueryPlanTest(TestCase):
+    """Запросы страниц на большой базе идут по индексам."""
+
+    @classmethod
+    def setUpTestData(cls):
+        authors = [
+            User.objects.create(username=f'author-{i}') for i in range(20)
+        ]
+        groups = [
+            Group.objects.create(
+                title=f'Группа {i}', slug=f'group-{i}', description='-'
+            )
+            for i in range(5)
+        ]
+        Post.objects.bulk_create(
+            Post(
+                author=authors[i % len(authors)],
+                group=groups[i % len(groups)] if i % 3 else None,
+                text=f'Пост {i}',
+            )
+            for i in range(2000)
+        )
+        for author in authors:
+            profiles.build_summary(author)
+        sitemap.rebuild()
+        cls.author = authors[0]
+        cls.post = Post.objects.filter(author=cls.author, group=groups[0])[0]
+        Comment.objects.bulk_create(
+            Comment(post_id=cls.post.pk, author=authors[1], text=f'Ком {i}')
+            for i in range(100)
+        )
+        Post.objects.filter(pk=cls.post.pk).update(comment_count=100)
+        PostScore.objects.bulk_create(
+            PostScore(post_id=post_id, group_id=group_id, score=post_id)
+            for post_id, group_id in Post.objects.values_list('pk', 'group')
+        )
+        cls.reader = User.objects.create(username='reader')
+        for author in authors[1:]:
+            Follow.objects.create(user=cls.reader, author=author)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self, name):
+        method, login, _ = EXPECTED[name]
+        kwargs = {
+            'posts:group_list': {'slug': 'group-0'},
+            'posts:group_trending': {'slug': 'group-0'},
+            'posts:profile': {'username': self.author.username},
+            'posts:profile_follow': {'username': self.author.username},
+            'posts:profile_unfollow': {'username': 'author-1'},
+            'posts:post_detail': {'post_id': self.post.pk},
+            'posts:add_comment': {'post_id': self.post.pk},
+            'posts:post_comments': {'post_id': self.post.pk},
+            'posts:post_edit': {'post_id': self.post.pk},
+            'posts:group_atom': {'slug': 'group-0'},
+            'posts:author_atom': {'username': self.author.username},
+            'posts:sitemap_shard': {'number': 0},
+        }.get(name, {})
+        if login:
+            self.client.force_login(
+                self.reader if name in READER_URLS else self.author
+            )
+        url = reverse(name, kwargs=kwargs)
+        cache.clear()
+        data = {'text': 'Комментарий'} if method == 'post' else None
+        with capture_queries() as queries:
+            response = getattr(self.client, method)(url, data)
+        self.assertLess(response.status_code, 400, name)
+        return queries
+
+    def test_every_url_listed(self):
+        names = {
+            f'{urls.app_name}:{pattern.name}' for pattern in urls.urlpatterns
+        }
+        self.assertEqual(names, set(EXPECTED))
+
+    def test_query_counts_and_plans(self):
+        """Число запросов не растёт, планы без полных проходов и сортировок."""
+        for name, (_, _, expected) in EXPECTED.items():
+            with self.subTest(url=name):
+                queries = self.request(name)
+                self.assertEqual(len(queries), expected)
+                self.assertEqual(plan_problems(queries), [])
@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, override_settings,
+)
+from django.urls import reverse
+
+from core import ratelimit
+
+User = get_user_model()
+
+
+class RateTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(ratelimit.parse_rate('10/m'), (10, 60))
+        self.assertEqual(ratelimit.parse_rate('5/h'), (5, 3600))
+
+    def test_previous_window_counts(self):
+        """Начало нового окна учитывает запросы из конца прошлого."""
+        for _ in range(2):
+            self.assertEqual(ratelimit.hit('x', 'ip:1', '2/m', now=119), 0)
+        self.assertEqual(ratelimit.hit('x', 'ip:1', '2/m', now=121), 59)
+        self.assertEqual(ratelimit.hit('x', 'ip:1', '2/m', now=300), 0)
+
+
+@override_settings(RATELIMIT_TRUSTED_PROXIES=['127.0.0.1'])
+class ClientIpTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_forwarded_address_behind_trusted_proxy(self):
+        request = self.factory.get(
+            '/', REMOTE_ADDR='127.0.0.1',
+            HTTP_X_FORWARDED_FOR='6.6.6.6, 10.0.0.1, 127.0.0.1',
+        )
+        self.assertEqual(ratelimit.client_ip(request), '10.0.0.1')
+
+    def test_forwarded_header_ignored_from_untrusted_client(self):
+        request = self.factory.get(
+            '/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='6.6.6.6'
+        )
+        self.assertEqual(ratelimit.client_ip(request), '10.0.0.1')
+
+
+@override_settings(RATELIMIT_POLICIES={'users:login': ('ip', '2/m')})
+class RateLimitMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('users:login')
+        self.data = {'username': 'nobody', 'password': 'wrong'}
+
+    def test_limit_returns_429_without_queries(self):
+        for _ in range(2):
+            response = self.client.post(self.url, self.data)
+            self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, self.data)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_get_and_other_clients_not_limited(self):
+        for _ in range(3):
+            self.client.post(self.url, self.data)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        response = self.client.post(
+            self.url, self.data, REMOTE_ADDR='10.0.0.2'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(
+        RATELIMIT_POLICIES={'posts:post_create': ('user', '1/m')}
+    )
+    def test_user_key_separates_users(self):
+        url = reverse('posts:post_create')
+        first = User.objects.create(username='first')
+        second = User.objects.create(username='second')
+        self.client.force_login(first)
+        self.client.post(url, {'text': 'Раз'})
+        self.assertEqual(
+            self.client.post(url, {'text': 'Два'}).status_code, 429
+        )
+        self.client.force_login(second)
+        self.assertEqual(
+            self.client.post(url, {'text': 'Три'}).status_code, 302
+        )
+
+    @override_settings(
+        RATELIMIT_POLICIES={'posts:post_create': ('user', '1/m')}
+    )
+    def test_new_session_does_not_reset_limit(self):
+        """Повторный вход с новой cookie сессии не сбрасывает лимит."""
+        url = reverse('posts:post_create')
+        user = User.objects.create(username='first')
+        self.client.force_login(user)
+        self.client.post(url, {'text': 'Раз'})
+        self.client.logout()
+        self.client.force_login(user)
+        self.assertEqual(
+            self.client.post(url, {'text': 'Два'}).status_code, 429
+        )
@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Post
+from posts.rendering import RENDERER_VERSION
+
+User = get_user_model()
+
+
+class PostRenderingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='<b>Смотрите</b> https://example.com\n\nВторой абзац',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_html_rendered_on_save(self):
+        """HTML экранирован, со ссылками и абзацами и хранится в посте."""
+        self.assertEqual(self.post.text_html_version, RENDERER_VERSION)
+        self.assertHTMLEqual(
+            self.post.text_html,
+            '<p>&lt;b&gt;Смотрите&lt;/b&gt; <a href="https://example.com" '
+            'rel="nofollow">https://example.com</a></p><p>Второй абзац</p>',
+        )
+
+    def test_partial_save_rerenders(self):
+        """Сохранение только текста обновляет и HTML."""
+        self.post.text = 'Новый текст'
+        self.post.save(update_fields=['text'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text_html, '<p>Новый текст</p>')
+
+    def test_stale_html_rendered_on_read_and_by_command(self):
+        """Устаревший HTML рендерится при чтении, а команда его обновляет."""
+        Post.objects.filter(pk=self.post.pk).update(
+            text='Другой текст', text_html='', text_html_version=0,
+        )
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, '<p>Другой текст</p>', html=True)
+        call_command('rerender_posts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(
+            (self.post.text_html, self.post.text_html_version),
+            ('<p>Другой текст</p>', RENDERER_VERSION),
+        )
+
+    def test_edit_rerenders(self):
+        """Правка поста через форму перерисовывает HTML."""
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Правка', 'group': ''},
+        )
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertContains(response, '<p>Правка</p>', html=True)
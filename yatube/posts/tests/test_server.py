@@ -0,0 +1,106 @@
+import socket
+import threading
+import time
+from urllib.request import urlopen
+
+from django.test import SimpleTestCase
+
+from core import server as server_module
+from core.server import (
+    PooledWSGIServer, PreforkServer, cpu_count, default_workers,
+)
+
+
+def hello(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [environ['PATH_INFO'].encode()]
+
+
+class PooledWSGIServerTest(SimpleTestCase):
+    def setUp(self):
+        self.socket = socket.create_server(('127.0.0.1', 0))
+        self.socket.setblocking(False)
+        self.server = PooledWSGIServer(self.socket, threads=2)
+        self.server.set_app(hello)
+        self.port = self.socket.getsockname()[1]
+
+    def tearDown(self):
+        self.server.server_close()
+
+    def test_requests_handled_and_counted(self):
+        """Запросы с общего сокета обрабатываются пулом и считаются."""
+        def serve():
+            for _ in range(2):
+                self.server.wait_and_handle(timeout=5)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        for path in ('/a/', '/b/'):
+            with urlopen(f'http://127.0.0.1:{self.port}{path}') as response:
+                self.assertEqual(response.read().decode(), path)
+        thread.join()
+        self.server.pool.shutdown(wait=True)
+        self.assertEqual(self.server.handled, 2)
+
+    def test_busy_worker_leaves_connection_to_others(self):
+        """Пока все потоки заняты, воркер не принимает новых соединений."""
+        release = threading.Event()
+
+        def slow(environ, start_response):
+            release.wait(5)
+            return hello(environ, start_response)
+
+        self.server.set_app(slow)
+        clients = [
+            socket.create_connection(('127.0.0.1', self.port))
+            for _ in range(3)
+        ]
+        for client in clients:
+            self.addCleanup(client.close)
+            client.sendall(b'GET / HTTP/1.0\r\n\r\n')
+        self.server.wait_and_handle(timeout=1)
+        self.server.wait_and_handle(timeout=1)
+        self.server.wait_and_handle(timeout=0.1)
+        self.assertEqual(self.server.pool._work_queue.qsize(), 0)
+        self.assertTrue(self.server.selector.select(0))
+        release.set()
+        self.server.wait_and_handle(timeout=5)
+        self.server.pool.shutdown(wait=True)
+        self.assertEqual(self.server.handled, 3)
+
+    def test_workers_sized_from_cpu_count(self):
+        """По умолчанию воркеров 2 * число ядер + 1."""
+        self.assertEqual(default_workers(), 2 * cpu_count() + 1)
+
+
+class RespawnTest(SimpleTestCase):
+    def setUp(self):
+        self.server = PreforkServer(None, ('127.0.0.1', 0), log=lambda _: 0)
+
+    def exit(self, pid, code, uptime):
+        self.server.children[pid] = time.monotonic() - uptime
+        # Статус waitpid: код выхода в старшем байте.
+        self.server.record_exit(pid, code << 8)
+
+    def test_startup_crashes_delay_respawn(self):
+        """Падения сразу после запуска откладывают новый воркер всё дольше."""
+        self.exit(1, code=1, uptime=0)
+        first = self.server.spawn_after - time.monotonic()
+        self.exit(2, code=1, uptime=0)
+        second = self.server.spawn_after - time.monotonic()
+        self.assertGreater(first, 0)
+        self.assertGreater(second, first)
+        self.assertNotIn(1, self.server.children)
+
+    def test_delay_capped_and_reset(self):
+        """Пауза ограничена сверху и сбрасывается штатным выходом воркера."""
+        for pid in range(20):
+            self.exit(pid, code=1, uptime=0)
+        self.assertLessEqual(
+            self.server.spawn_after - time.monotonic(),
+            server_module.RESPAWN_DELAY_MAX,
+        )
+        self.exit(100, code=0, uptime=0)
+        self.assertEqual(self.server.crashes, 0)
+        self.exit(101, code=1, uptime=server_module.MIN_WORKER_UPTIME)
+        self.assertEqual(self.server.crashes, 0)
@@ -0,0 +1,63 @@
+import importlib
+import os
+import sys
+from unittest import mock
+
+from django.core.checks import run_checks
+from django.test import SimpleTestCase, override_settings
+
+
+class SettingsProfilesTest(SimpleTestCase):
+    def load_production(self, **environ):
+        sys.modules.pop('yatube.settings.production', None)
+        self.addCleanup(sys.modules.pop, 'yatube.settings.production', None)
+        environ = {'YATUBE_SECRET_KEY': 'secret', **environ}
+        with mock.patch.dict(os.environ, environ):
+            return importlib.import_module('yatube.settings.production')
+
+    def test_production_profile_is_tuned(self):
+        """Рабочий профиль включает настройки производительности."""
+        production = self.load_production()
+        self.assertFalse(production.DEBUG)
+        self.assertGreater(production.DATABASES['default']['CONN_MAX_AGE'], 0)
+        self.assertEqual(
+            production.TEMPLATES[0]['OPTIONS']['loaders'][0][0],
+            'django.template.loaders.cached.Loader',
+        )
+        self.assertIn(
+            'django.middleware.gzip.GZipMiddleware', production.MIDDLEWARE
+        )
+        self.assertIn('Manifest', production.STATICFILES_STORAGE)
+        self.assertTrue(production.SESSION_ENGINE.endswith('cached_db'))
+        self.assertNotIn(
+            'django.template.context_processors.debug',
+            production.TEMPLATES[0]['OPTIONS']['context_processors'],
+        )
+
+    def test_production_ratelimit_needs_memcached(self):
+        """Ограничение частоты включается только вместе с memcached."""
+        with mock.patch.dict(os.environ):
+            os.environ.pop('YATUBE_MEMCACHED', None)
+            self.assertEqual(self.load_production().RATELIMIT_POLICIES, {})
+        production = self.load_production(YATUBE_MEMCACHED='127.0.0.1:11211')
+        self.assertTrue(production.RATELIMIT_POLICIES)
+        self.assertEqual(production.RATELIMIT_TRUSTED_PROXIES, ['127.0.0.1'])
+
+    def test_production_profile_does_not_touch_base(self):
+        """Рабочий профиль не меняет общие настройки на месте."""
+        from yatube.settings import base
+
+        self.load_production()
+        self.assertNotIn('loaders', base.TEMPLATES[0]['OPTIONS'])
+        self.assertFalse(base.DATABASES['default'].get('CONN_MAX_AGE'))
+
+    @override_settings(DEBUG=True)
+    def test_development_flagged_by_deploy_checks(self):
+        """check --deploy находит ненастроенную производительность."""
+        messages = run_checks(
+            include_deployment_checks=True, tags=['performance']
+        )
+        self.assertEqual(
+            {message.id for message in messages},
+            {f'core.W00{number}' for number in range(1, 9)},
+        )
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import sharding, trending
+from posts.archive import archive_posts
+from posts.models import ArchivedPost, Group, Post
+
+User = get_user_model()
+
+
+@skipUnless(
+    settings.POST_SHARDS,
+    'Запускается с --settings=yatube.settings.shards',
+)
+class ShardingTest(TestCase):
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+        cls.authors = [
+            User.objects.create(username=f'author_{i}') for i in range(3)
+        ]
+        cls.posts = [
+            Post.objects.create(author=author, text=author.username,
+                                group=cls.group)
+            for author in cls.authors
+        ]
+
+    def test_posts_stored_in_author_shard(self):
+        """Пост сохраняется в шард автора, пользователи есть во всех."""
+        for post in self.posts:
+            with self.subTest(post=post):
+                alias = sharding.shard_for_author(post.author_id)
+                self.assertEqual(post._state.db, alias)
+                self.assertTrue(
+                    Post.objects.using(alias).filter(pk=post.pk).exists()
+                )
+        for alias in settings.POST_SHARDS:
+            self.assertEqual(User.objects.using(alias).count(), 3)
+
+    def test_feeds_merge_all_shards(self):
+        """Главная и лента группы собирают посты из всех шардов."""
+        expected = [post.text for post in reversed(self.posts)]
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test_slug'}),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                texts = [post.text for post in response.context['page_obj']]
+                self.assertEqual(texts, expected)
+
+    def test_single_shard_lookups(self):
+        """Пост и профиль читаются из шарда автора."""
+        post = self.posts[1]
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        self.assertEqual(response.context['post'].text, post.text)
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': post.author})
+        )
+        self.assertEqual(
+            [p.text for p in response.context['page_obj']], [post.text]
+        )
+
+    def test_rebalance_moves_misplaced_posts(self):
+        """После смены числа шардов посты переезжают в новый шард.
+
+        Дата публикации и рейтинг переезжают вместе с постом, поэтому
+        порядок лент и популярного не меняется.
+        """
+        now = timezone.now()
+        for days, post in enumerate(self.posts, start=1):
+            Post.objects.using(post._state.db).filter(pk=post.pk).update(
+                pub_date=now - timedelta(days=days)
+            )
+        pub_dates = {
+            post.pk: sharding.get_post(post.pk).pub_date
+            for post in self.posts
+        }
+        index = reverse('posts:index')
+        feed = [post.text for post in self.client.get(index).context[
+            'page_obj'
+        ]]
+        top = [post.pk for post in trending.top_posts()]
+        with override_settings(POST_SHARDS=['default', 'shard_1']):
+            for alias in ('default', 'shard_1', 'shard_2'):
+                sharding.move_posts(
+                    alias, sharding.misplaced_posts(alias), batch_size=1
+                )
+            self.assertEqual(Post.objects.using('shard_2').count(), 0)
+            for post in self.posts:
+                moved = sharding.get_post(post.pk)
+                self.assertEqual(moved.text, post.text)
+                self.assertEqual(moved.pub_date, pub_dates[post.pk])
+            self.assertEqual(
+                [post.text for post in self.client.get(index).context[
+                    'page_obj'
+                ]],
+                feed,
+            )
+            self.assertEqual(
+                [post.pk for post in trending.top_posts()], top
+            )
+
+    def test_rebalance_keeps_profile_post_count(self):
+        """Перенос поста в другой шард не уменьшает число постов автора."""
+        post = self.posts[2]
+        url = reverse('posts:profile', kwargs={'username': post.author})
+        self.client.get(url)
+        with override_settings(POST_SHARDS=['default', 'shard_1']):
+            for alias in ('default', 'shard_1', 'shard_2'):
+                sharding.move_posts(
+                    alias, sharding.misplaced_posts(alias), batch_size=1
+                )
+            cache.clear()
+            page = self.client.get(url).context['page_obj']
+            self.assertEqual(page.paginator.count, 1)
+            self.assertEqual([p.text for p in page], [post.text])
+
+    def test_archive_reads_every_shard(self):
+        """Архивация переносит старые посты из всех шардов."""
+        for post in self.posts:
+            Post.objects.using(post._state.db).filter(pk=post.pk).update(
+                pub_date=timezone.now() - timedelta(days=400)
+            )
+        self.assertEqual(
+            archive_posts(days=365, batch_size=1), len(self.posts)
+        )
+        for alias in settings.POST_SHARDS:
+            self.assertEqual(Post.objects.using(alias).count(), 0)
+        self.assertEqual(
+            set(ArchivedPost.objects.values_list('pk', flat=True)),
+            {post.pk for post in self.posts},
+        )
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.posts[1].pk})
+        )
+        self.assertEqual(response.context['post'].text, self.posts[1].text)
@@ -0,0 +1,96 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts import sitemap
+from posts.models import Group, Post, SitemapShard
+
+User = get_user_model()
+
+
+@override_settings(SITEMAP_SHARD_SIZE=2)
+class SitemapTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.posts = [
+            Post.objects.create(author=self.user, text=f'Пост {i}')
+            for i in range(3)
+        ]
+
+    def shard_url(self, post):
+        number = (post.pk - 1) // settings.SITEMAP_SHARD_SIZE
+        return reverse('posts:sitemap_shard', kwargs={'number': number})
+
+    def test_index_lists_shards_with_lastmod(self):
+        response = self.client.get(reverse('posts:sitemap_index'))
+        self.assertContains(response, 'http://testserver/sitemap-pages.xml')
+        for shard in SitemapShard.objects.all():
+            self.assertContains(
+                response,
+                f'<loc>http://testserver/sitemap-{shard.number}.xml</loc>'
+                f'<lastmod>{shard.lastmod.isoformat()}</lastmod>',
+            )
+
+    def test_shard_lists_posts_in_range(self):
+        post = self.posts[-1]
+        response = self.client.get(self.shard_url(post))
+        self.assertContains(
+            response, f'<loc>http://testserver/posts/{post.pk}/</loc>'
+        )
+
+    def test_shard_served_from_cache(self):
+        url = self.shard_url(self.posts[-1])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    @override_settings(SITEMAP_SHARD_SIZE=10000)
+    def test_new_post_invalidates_shard(self):
+        url = self.shard_url(self.posts[-1])
+        self.client.get(url)
+        new = Post.objects.create(author=self.user, text='Новый')
+        self.assertEqual(self.shard_url(new), url)
+        self.assertContains(self.client.get(url), f'/posts/{new.pk}/')
+
+    def test_unknown_shard_is_404_and_not_cached(self):
+        number = SitemapShard.objects.order_by('-number').first().number + 1
+        url = reverse('posts:sitemap_shard', kwargs={'number': number})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertIsNone(cache.get(sitemap.cache_key(number)))
+
+    def test_deleted_post_removed_and_lastmod_bumped(self):
+        post = self.posts[0]
+        url = self.shard_url(post)
+        self.client.get(url)
+        shard = SitemapShard.objects.get(number=(post.pk - 1) // 2)
+        post.delete()
+        self.assertNotContains(self.client.get(url), f'/posts/{post.pk}/')
+        self.assertGreater(
+            SitemapShard.objects.get(pk=shard.pk).lastmod, shard.lastmod
+        )
+
+    def test_pages_sitemap_lists_groups(self):
+        response = self.client.get(reverse('posts:sitemap_pages'))
+        self.assertContains(response, 'http://testserver/group/test_slug/')
+
+    def test_rebuild_creates_missing_shards(self):
+        SitemapShard.objects.all().delete()
+        call_command('rebuild_sitemap', stdout=StringIO())
+        self.assertEqual(
+            SitemapShard.objects.count(), (self.posts[-1].pk - 1) // 2 + 1
+        )
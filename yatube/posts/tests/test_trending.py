@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class TrendingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+        cls.old_post = Post.objects.create(
+            author=cls.user, text='Старый', group=cls.group,
+        )
+        cls.new_post = Post.objects.create(author=cls.user, text='Новый')
+
+    def test_views_raise_post(self):
+        """Просмотры поднимают пост в ленте популярного."""
+        trending.add_events({self.old_post.pk: 100})
+        response = self.client.get(reverse('posts:trending'))
+        texts = [post.text for post in response.context['posts']]
+        self.assertEqual(texts, ['Старый', 'Новый'])
+
+    def test_old_events_decay(self):
+        """Давние просмотры весят меньше свежих."""
+        long_ago = timezone.now() - timedelta(days=30)
+        trending.add_events({self.old_post.pk: 100}, when=long_ago)
+        trending.add_events({self.new_post.pk: 1})
+        texts = [post.text for post in trending.top_posts()]
+        self.assertEqual(texts, ['Новый', 'Старый'])
+
+    def test_group_trending(self):
+        """В популярном группы только посты этой группы."""
+        response = self.client.get(
+            reverse('posts:group_trending', kwargs={'slug': 'test_slug'})
+        )
+        self.assertEqual(list(response.context['posts']), [self.old_post])
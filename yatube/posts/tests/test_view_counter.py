@@ -0,0 +1,111 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.signals import worker_stopping
+from posts import view_counter
+from posts.models import Post, PostScore
+
+User = get_user_model()
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=60)
+class ViewCounterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        view_counter.flush()
+        cls.user = User.objects.create(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.other = Post.objects.create(author=cls.user, text='Другой пост')
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.pk}
+        )
+
+    def tearDown(self):
+        view_counter.flush()
+
+    def test_views_are_buffered(self):
+        """Просмотры копятся в памяти и видны на странице до записи."""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['views'], 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+
+    def test_flush_writes_counts_and_scores(self):
+        """Сброс буфера обновляет счётчики и рейтинг популярного."""
+        score = PostScore.objects.get(pk=self.post.pk).score
+        for _ in range(3):
+            view_counter.record_view(self.post)
+        view_counter.record_view(self.other)
+        with self.assertNumQueries(9):
+            self.assertEqual(view_counter.flush(), 4)
+        self.post.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.post.views, self.other.views), (3, 1))
+        self.assertGreater(PostScore.objects.get(pk=self.post.pk).score, score)
+        self.assertEqual(view_counter.flush(), 0)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_flush_when_interval_elapsed(self):
+        """По истечении интервала просмотр записывается сразу."""
+        self.client.get(self.url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    def test_flush_when_buffer_full(self):
+        """Полный буфер сбрасывается таймером сразу, без ожидания интервала."""
+        flushed = threading.Event()
+        with override_settings(VIEW_COUNT_FLUSH_SIZE=2), \
+                mock.patch.object(view_counter, 'flush', flushed.set):
+            view_counter.record_view(self.post)
+            view_counter.record_view(self.other)
+            self.assertTrue(flushed.wait(5))
+
+    def test_failed_write_keeps_views(self):
+        """Ошибка записи возвращает просмотры в буфер."""
+        view_counter.record_view(self.post)
+        view_counter.record_view(self.post)
+        with mock.patch.object(
+            view_counter.trending, 'add_events', side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                view_counter.flush()
+        self.assertEqual(view_counter.pending_views(self.post), 2)
+        self.assertEqual(view_counter.flush(), 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
+
+    def test_flush_keeps_post_in_object_cache(self):
+        """Запись просмотров не вытесняет пост из кеша объектов."""
+        self.client.get(self.url)
+        view_counter.flush()
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_flush_on_worker_stopping(self):
+        """Остановка воркера сервера сбрасывает буфер просмотров."""
+        view_counter.record_view(self.post)
+        worker_stopping.send(sender=None)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    def test_timer_flushes_without_new_requests(self):
+        """Просмотр записывается по таймеру, даже если запросов больше нет."""
+        flushed = threading.Event()
+        view_counter.flush()
+        with override_settings(VIEW_COUNT_FLUSH_INTERVAL=0.05), \
+                mock.patch.object(view_counter, 'flush', flushed.set):
+            view_counter.record_view(self.post)
+            self.assertIsNotNone(view_counter._timer)
+            self.assertTrue(flushed.wait(5))
@@ -0,0 +1,94 @@
+"""Лента подписок, собранная заранее (fan-out on write).
+
+Выборка `Post.objects.filter(author__in=...)` с сортировкой по дате
+читает посты всех авторов подписки и сортирует их, и на тысячах подписок
+это уже сотни миллисекунд на страницу. Вместо этого при публикации поста
+каждому подписчику автора добавляется строка TimelineEntry, а страница
+ленты читает первые строки индекса `(user, -pub_date)` и подгружает
+посты по id. Подписка добавляет в ленту TIMELINE_BACKFILL последних
+постов автора, отписка убирает все его посты.
+"""
+from django.conf import settings
+
+from . import sharding
+from .group_feed import hydrate
+from .models import Follow, TimelineEntry
+
+
+def post_database(author_id):
+    if sharding.is_enabled():
+        return sharding.shard_for_author(author_id)
+    return 'default'
+
+
+def entries_for(post, user_ids):
+    return [
+        TimelineEntry(
+            user_id=user_id,
+            author_id=post.author_id,
+            post_id=post.pk,
+            pub_date=post.pub_date,
+        )
+        for user_id in user_ids
+    ]
+
+
+def fan_out(post):
+    """Добавляет новый пост в ленты всех подписчиков автора."""
+    followers = Follow.objects.filter(
+        author_id=post.author_id
+    ).values_list('user_id', flat=True)
+    TimelineEntry.objects.bulk_create(
+        entries_for(post, followers),
+        batch_size=settings.TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def backfill(follow):
+    """Добавляет в ленту подписчика последние посты автора."""
+    posts = follow.author.posts.only('author_id', 'pub_date')
+    TimelineEntry.objects.bulk_create(
+        [
+            entry
+            for post in posts[:settings.TIMELINE_BACKFILL]
+            for entry in entries_for(post, [follow.user_id])
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def unfollowed(follow):
+    TimelineEntry.objects.filter(
+        user_id=follow.user_id, author_id=follow.author_id
+    ).delete()
+
+
+def forget(post, using):
+    """Убирает удалённый (или архивированный) пост из всех лент.
+
+    Перенос поста между шардами тоже удаляет его из старой базы, но в
+    ленте он должен остаться.
+    """
+    if post_database(post.author_id) != using:
+        return
+    TimelineEntry.objects.filter(post_id=post.pk).delete()
+
+
+class Timeline:
+    """Последовательность постов ленты подписок для Paginator."""
+
+    def __init__(self, user):
+        self.entries = user.timeline.order_by('-pub_date')
+
+    def count(self):
+        return self.entries.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        rows = self.entries.values_list('author_id', 'post_id')[index]
+        return hydrate([
+            (post_database(author_id), post_id)
+            for author_id, post_id in rows
+        ])
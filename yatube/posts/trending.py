@@ -0,0 +1,84 @@
+"""Лента популярного с рейтингом, затухающим со временем.
+
+Событие с весом `w` в момент `t` добавляет к рейтингу `w * 2 ** (t / T)`,
+где T — период полураспада. Рейтинг хранится как логарифм этой суммы,
+поэтому сравнение рейтингов даёт тот же порядок, что и честное затухание
+всех событий, а чтение первых N постов идёт по индексу без пересчётов.
+"""
+import heapq
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import sharding
+from .models import PostScore
+
+EPOCH = datetime(2022, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def event_score(weight, when=None):
+    """Логарифм вклада события с весом `weight` в момент `when`."""
+    when = when or timezone.now()
+    hours = (when - EPOCH).total_seconds() / 3600
+    return math.log2(weight) + hours / settings.TRENDING_HALF_LIFE_HOURS
+
+
+def log_add(a, b):
+    """log2(2 ** a + 2 ** b) без переполнения."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def add_events(weights, when=None, using='default'):
+    """Добавляет события к рейтингам постов: {post_id: суммарный вес}.
+
+    Рейтинг лежит в той же базе, что и пост (`using`).
+    """
+    with transaction.atomic(using=using):
+        scores = PostScore.objects.using(using).select_for_update().in_bulk(
+            list(weights)
+        )
+        for post_id, weight in weights.items():
+            increment = event_score(weight, when)
+            score = scores.get(post_id)
+            if score is None:
+                continue
+            score.score = log_add(score.score, increment)
+            score.save(update_fields=['score'])
+
+
+def track_post(post, using='default'):
+    """Заводит рейтинг нового поста или переносит его в новую группу."""
+    scores = PostScore.objects.using(using)
+    updated = scores.filter(post_id=post.pk).update(group_id=post.group_id)
+    if not updated:
+        scores.create(
+            post_id=post.pk,
+            group_id=post.group_id,
+            score=event_score(
+                settings.TRENDING_POST_WEIGHT, post.pub_date
+            ),
+        )
+
+
+def top_posts(group=None):
+    """Первые TRENDING_SIZE постов по рейтингу из всех баз с постами."""
+    size = settings.TRENDING_SIZE
+    scores = PostScore.objects.order_by('-score').select_related(
+        'post__author', 'post__group'
+    )
+    if group is not None:
+        scores = scores.filter(group_id=group.pk)
+    best = heapq.nlargest(
+        size,
+        (
+            score
+            for alias in sharding.shards() or ['default']
+            for score in scores.using(alias)[:size]
+        ),
+        key=lambda score: score.score,
+    )
+    return [score.post for score in best]
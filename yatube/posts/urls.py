@@ -6,9 +6,53 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending_posts, name='trending'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path(
+        'group/<slug:slug>/trending/',
+        views.group_trending,
+        name='group_trending'
+    ),
+    path(
+        'group/<slug:slug>/feed/',
+        views.group_atom,
+        name='group_atom'
+    ),
+    path('follow/', views.follow_index, name='follow_index'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/feed/',
+        views.author_atom,
+        name='author_atom'
+    ),
+    path(
+        'profile/<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comment/',
+        views.add_comment,
+        name='add_comment'
+    ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path('create/', views.post_create, name='post_create'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path('sitemap-pages.xml', views.sitemap_pages, name='sitemap_pages'),
+    path(
+        'sitemap-<int:number>.xml',
+        views.sitemap_shard,
+        name='sitemap_shard'
+    ),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit')
 ]
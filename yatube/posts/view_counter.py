@@ -0,0 +1,126 @@
+"""Счётчик просмотров постов с накоплением записей в памяти процесса.
+
+Просмотры копятся в словаре и записываются одной транзакцией: по одному
+UPDATE на каждое встречающееся число просмотров. Запись идёт в потоке
+таймера, а не в запросе: первый просмотр после сброса заводит таймер на
+VIEW_COUNT_FLUSH_INTERVAL секунд, а когда в буфере набирается
+VIEW_COUNT_FLUSH_SIZE постов, таймер срабатывает сразу. Если запись не
+удалась, просмотры возвращаются в буфер до следующего сброса. При
+падении процесса теряются только просмотры за последний интервал; при
+штатной остановке буфер сбрасывается через atexit, а в воркерах
+`manage.py serve` — по сигналу worker_stopping. Нулевой интервал
+означает запись прямо в запросе (так работают тесты).
+
+Записанные просмотры не сбрасывают пост в кеше объектов, иначе
+популярные посты вытеснялись бы оттуда каждый интервал. Поэтому число
+просмотров на странице может отставать от базы на время жизни записи
+кеша (OBJECT_CACHE_TIMEOUT).
+"""
+import atexit
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from . import trending
+from .models import Post
+
+_lock = threading.Lock()
+_pending = Counter()
+_timer = None
+
+
+def record_view(post):
+    """Учитывает просмотр; запись в базу откладывается на поток таймера."""
+    global _timer
+    interval = settings.VIEW_COUNT_FLUSH_INTERVAL
+    if interval <= 0:
+        with _lock:
+            _pending[post._state.db, post.pk] += 1
+        flush()
+        return
+    with _lock:
+        _pending[post._state.db, post.pk] += 1
+        full = len(_pending) >= settings.VIEW_COUNT_FLUSH_SIZE
+        if full and _timer is not None and _timer.interval:
+            _timer.cancel()
+            _timer = None
+        if _timer is None:
+            _timer = threading.Timer(0 if full else interval, flush_from_timer)
+            _timer.daemon = True
+            _timer.start()
+
+
+def flush_from_timer():
+    try:
+        flush()
+    finally:
+        # У потока таймера своё соединение с базой.
+        connection.close()
+
+
+def pending_views(post):
+    """Просмотры поста, ещё не записанные в базу этим процессом."""
+    return _pending.get((post._state.db, post.pk), 0)
+
+
+def flush():
+    """Записывает накопленные просмотры, возвращает их число."""
+    global _pending, _timer
+    with _lock:
+        batch, _pending = _pending, Counter()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    by_database = defaultdict(dict)
+    for (using, post_id), views in batch.items():
+        by_database[using][post_id] = views
+    written = 0
+    for using, views in list(by_database.items()):
+        try:
+            write_views(using, views)
+        except Exception:
+            # Просмотры незаписанных баз возвращаются в буфер, и таймер
+            # повторит попытку.
+            restore({
+                key: count for key, count in batch.items()
+                if key[0] in by_database
+            })
+            raise
+        del by_database[using]
+        written += sum(views.values())
+    return written
+
+
+def restore(views):
+    global _timer
+    interval = settings.VIEW_COUNT_FLUSH_INTERVAL
+    with _lock:
+        _pending.update(views)
+        if interval > 0 and _timer is None:
+            _timer = threading.Timer(interval, flush_from_timer)
+            _timer.daemon = True
+            _timer.start()
+
+
+def write_views(using, views):
+    by_count = defaultdict(list)
+    for post_id, count in views.items():
+        by_count[count].append(post_id)
+    with transaction.atomic(using=using):
+        for count, ids in by_count.items():
+            Post.objects.using(using).filter(pk__in=ids).update(
+                views=F('views') + count
+            )
+        trending.add_events(
+            {
+                post_id: count * settings.TRENDING_VIEW_WEIGHT
+                for post_id, count in views.items()
+            },
+            using=using,
+        )
+
+
+atexit.register(flush)
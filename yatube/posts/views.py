@@ -1,14 +1,26 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
+from django.urls import reverse
 
-from yatube.settings import POSTS_ON_PAGE
-from .models import Group, Post, User
-from .forms import PostForm
+from core import object_cache
+from . import (
+    comments, feeds, group_feed, profiles, sharding, sitemap, timeline,
+    trending, view_counter,
+)
+from .editing import EditConflict, save_changes
+from .models import ArchivedPost, Follow, Group, Post, User
+from .forms import CommentForm, PostForm
+
+ATOM_CONTENT_TYPE = 'application/atom+xml; charset=utf-8'
+
+XML_CONTENT_TYPE = 'application/xml; charset=utf-8'
 
 
 def get_page_context(queryset, request):
-    paginator = Paginator(queryset, POSTS_ON_PAGE)
+    paginator = Paginator(queryset, settings.POSTS_ON_PAGE)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return {
@@ -18,41 +30,116 @@ def get_page_context(queryset, request):
     }
 
 
+def base_url(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def get_post(post_id):
+    return object_cache.get_object(Post, loader=sharding.get_post, pk=post_id)
+
+
 def index(request):
-    context = get_page_context(Post.objects.all(), request)
+    posts = Post.objects.select_related('author', 'group')
+    context = get_page_context(sharding.scatter(posts), request)
     return render(request, 'posts/index.html', context)
 
 
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    group = object_cache.get_object_or_404(Group, slug=slug)
     context = {
         'group': group,
-        'posts': posts,
     }
-    context.update(get_page_context(group.posts.all(), request))
+    context.update(get_page_context(group_feed.GroupFeed(group), request))
     return render(request, 'posts/group_list.html', context)
 
 
+def trending_posts(request):
+    context = {
+        'posts': trending.top_posts(),
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+def group_trending(request, slug):
+    group = object_cache.get_object_or_404(Group, slug=slug)
+    context = {
+        'group': group,
+        'posts': trending.top_posts(group),
+    }
+    return render(request, 'posts/trending.html', context)
+
+
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = object_cache.get_object_or_404(User, username=username)
+    summary = profiles.get_summary(author)
+    following = (
+        request.user.is_authenticated
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
     context = {
         'author': author,
+        'summary': summary,
+        'following': following,
     }
-    context.update(get_page_context(author.posts.all(), request))
+    posts = profiles.ProfilePosts(author, summary)
+    context.update(get_page_context(posts, request))
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    post_count = post.author.posts.all().count()
+    post = (
+        get_post(post_id)
+        or get_object_or_404(
+            ArchivedPost.objects.select_related('author', 'group'),
+            pk=post_id,
+        )
+    )
+    page, next_cursor = [], None
+    if post.comment_count:
+        page, next_cursor = comments.comment_page(post.pk)
     context = {
         'post': post,
-        'post_count': post_count,
+        'post_count': profiles.get_summary(post.author).post_count,
+        'comments': page,
+        'next_cursor': next_cursor,
     }
+    if isinstance(post, Post):
+        view_counter.record_view(post)
+        context['views'] = post.views + view_counter.pending_views(post)
+        context['form'] = CommentForm()
     return render(request, 'posts/post_detail.html', context)
 
 
+def post_comments(request, post_id):
+    """Следующая порция комментариев для кнопки «Показать ещё»."""
+    try:
+        page, next_cursor = comments.comment_page(
+            post_id, request.GET.get('after')
+        )
+    except ValueError:
+        raise Http404
+    context = {
+        'post_id': post_id,
+        'comments': page,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'posts/includes/comments.html', context)
+
+
+@login_required
+def add_comment(request, post_id):
+    post = get_post(post_id)
+    if post is None:
+        raise Http404
+    form = CommentForm(request.POST or None)
+    if form.is_valid():
+        comment = form.save(commit=False)
+        comment.author = request.user
+        comment.post_id = post.pk
+        comment.save()
+    return redirect('posts:post_detail', post_id)
+
+
 @login_required
 def post_create(request):
     groups = Group.objects.all()
@@ -69,20 +156,126 @@ def post_create(request):
     return render(request, 'posts/create_post.html', context)
 
 
+def get_version(request, default):
+    """Версия поста, которую видел автор, из скрытого поля формы."""
+    try:
+        return int(request.POST['version'])
+    except (KeyError, ValueError):
+        return default
+
+
 @login_required
 def post_edit(request, post_id):
     is_edit = True
-    post = get_object_or_404(Post, pk=post_id)
-    if request.user == post.author:
+    post = get_post(post_id)
+    if post is None:
+        raise Http404
+    version = post.version
+    if request.user.pk == post.author_id:
         form = PostForm(request.POST or None, instance=post)
         if form.is_valid():
-            form.save()
+            if not form.has_changed():
+                return redirect('posts:post_detail', post_id)
+            try:
+                save_changes(
+                    post, form.changed_data, get_version(request, version)
+                )
+            except EditConflict:
+                # Введённый текст возвращается в форму, а рядом показывается
+                # сохранённая версия, чтобы правку не пришлось набирать заново.
+                post = get_post(post_id)
+                return render(
+                    request,
+                    'posts/create_post.html',
+                    {
+                        'form': PostForm(request.POST, instance=post),
+                        'groups': Group.objects.all(),
+                        'is_edit': is_edit,
+                        'version': post.version,
+                        'conflict': True,
+                        'saved_post': post,
+                    },
+                    status=409,
+                )
             return redirect('posts:post_detail', post_id)
     groups = Group.objects.all()
     form = PostForm(instance=post)
     context = {
         'form': form,
         'groups': groups,
-        'is_edit': is_edit
+        'is_edit': is_edit,
+        'version': version,
     }
     return render(request, 'posts/create_post.html', context)
+
+
+@login_required
+def follow_index(request):
+    context = get_page_context(timeline.Timeline(request.user), request)
+    return render(request, 'posts/follow.html', context)
+
+
+@login_required
+def profile_follow(request, username):
+    author = object_cache.get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username=username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = object_cache.get_object_or_404(User, username=username)
+    Follow.objects.filter(user=request.user, author=author).delete()
+    return redirect('posts:profile', username=username)
+
+
+def group_atom(request, slug):
+    group = object_cache.get_object_or_404(Group, slug=slug)
+    content = feeds.document(
+        request, 'group', group.pk,
+        lambda: feeds.build(
+            request,
+            group.title,
+            reverse('posts:group_list', kwargs={'slug': slug}),
+            group_feed.GroupFeed(group)[:settings.FEED_SIZE],
+        ),
+    )
+    return HttpResponse(content, content_type=ATOM_CONTENT_TYPE)
+
+
+def author_atom(request, username):
+    author = object_cache.get_object_or_404(User, username=username)
+
+    def build():
+        summary = profiles.get_summary(author)
+        return feeds.build(
+            request,
+            summary.display_name,
+            reverse('posts:profile', kwargs={'username': username}),
+            profiles.ProfilePosts(author, summary)[:settings.FEED_SIZE],
+        )
+
+    content = feeds.document(request, 'author', author.pk, build)
+    return HttpResponse(content, content_type=ATOM_CONTENT_TYPE)
+
+
+def sitemap_index(request):
+    return HttpResponse(
+        sitemap.render_index(base_url(request)),
+        content_type=XML_CONTENT_TYPE,
+    )
+
+
+def sitemap_pages(request):
+    return HttpResponse(
+        sitemap.render_pages(base_url(request)),
+        content_type=XML_CONTENT_TYPE,
+    )
+
+
+def sitemap_shard(request, number):
+    content = sitemap.render_shard(base_url(request), number)
+    if content is None:
+        raise Http404
+    return HttpResponse(content, content_type=XML_CONTENT_TYPE)
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        # Валидаторы паролей создаются при старте процесса, а не при первой
+        # регистрации: список распространённых паролей читается здесь.
+        from django.contrib.auth.password_validation import (
+            get_default_password_validators
+        )
+        get_default_password_validators()
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 с числом итераций из настройки PASSWORD_HASH_ITERATIONS.
+
+    Алгоритм совпадает со стандартным `pbkdf2_sha256`, поэтому старые хеши
+    проверяются этим же классом, а при входе пользователя Django сам
+    пересчитывает пароль с новым числом итераций. Число итераций не
+    бывает меньше стандартного для этой версии Django, иначе каждый вход
+    ослаблял бы уже сохранённые хеши.
+    """
+
+    @property
+    def iterations(self):
+        # Настройка читается при каждом хешировании, а не при импорте
+        # класса, поэтому override_settings и смена профиля работают.
+        return max(
+            getattr(settings, 'PASSWORD_HASH_ITERATIONS', 0),
+            PBKDF2PasswordHasher.iterations,
+        )
@@ -0,0 +1,29 @@
+import gzip
+from functools import lru_cache
+
+from django.contrib.auth import password_validation
+
+
+@lru_cache(maxsize=None)
+def load_common_passwords(path):
+    """Читает список распространённых паролей один раз на процесс."""
+    try:
+        with gzip.open(str(path)) as f:
+            lines = f.read().decode().splitlines()
+    except IOError:
+        with open(str(path)) as f:
+            lines = f.readlines()
+    return frozenset(line.strip() for line in lines)
+
+
+class CommonPasswordValidator(password_validation.CommonPasswordValidator):
+    """Валидатор с общим для всех экземпляров множеством паролей."""
+
+    def __init__(
+        self,
+        password_list_path=(
+            password_validation.CommonPasswordValidator
+            .DEFAULT_PASSWORD_LIST_PATH
+        ),
+    ):
+        self.passwords = load_common_passwords(password_list_path)
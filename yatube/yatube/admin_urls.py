@@ -0,0 +1,10 @@
+"""URL админки для ленивого подключения (LAZY_URLCONFS).
+
+Модуль импортируется при первом обращении к `/admin/`, поэтому обход
+`admin.py` приложений и построение URL всех ModelAdmin не замедляют старт.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
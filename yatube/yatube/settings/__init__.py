@@ -0,0 +1,19 @@
+"""Настройки yatube, разложенные по профилям.
+
+    base.py         общие настройки
+    development.py  локальная разработка и тесты (по умолчанию)
+    production.py   рабочий сервер, значения берутся из окружения
+    shards.py       development с постами в трёх SQLite-файлах
+
+Профиль выбирается переменной окружения YATUBE_PROFILE.
+"""
+import os
+
+PROFILE = os.environ.get('YATUBE_PROFILE', 'development')
+
+if PROFILE == 'production':
+    from .production import *  # noqa: F401,F403
+elif PROFILE == 'development':
+    from .development import *  # noqa: F401,F403
+else:
+    raise ImportError(f'Неизвестный профиль настроек YATUBE_PROFILE={PROFILE}')
@@ -0,0 +1,282 @@
+"""
+Django settings for yatube project: common to all profiles.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+Профили development и production дополняют эти настройки, профиль
+выбирается переменной окружения YATUBE_PROFILE (см. __init__.py).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+DEBUG = False
+
+
+# Application definition
+
+# Ленивое подключение редко используемых разделов (admin/, about/, сброс
+# пароля): их URL и admin.py импортируются при первом обращении. Флаг
+# читается из окружения здесь, потому что от него зависит конфигурация
+# приложения admin ниже; профили его не переопределяют.
+LAZY_URLCONFS = os.environ.get('YATUBE_LAZY_URLCONFS') == '1'
+
+INSTALLED_APPS = [
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about.apps.AboutConfig',
+    (
+        'django.contrib.admin.apps.SimpleAdminConfig' if LAZY_URLCONFS
+        else 'django.contrib.admin'
+    ),
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    # Выше PrebuiltPageMiddleware: собранные страницы тоже получают
+    # X-Frame-Options.
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.MemoryProfilerMiddleware',
+    'core.middleware.ContextProcessorTimingMiddleware',
+    'core.middleware.PrebuiltPageMiddleware',
+    'core.middleware.RateLimitMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+TEST_RUNNER = 'core.test_runner.FastTestRunner'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+# Псевдонимы баз из DATABASES, по которым разносятся посты по id автора.
+# Пустой список выключает шардинг.
+POST_SHARDS = []
+
+DATABASE_ROUTERS = ['posts.routers.PostShardRouter']
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'users.validators.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Первый хешер в списке используется для новых паролей, остальные только
+# проверяют старые хеши. При входе пароль пересчитывается первым хешером.
+# Для argon2/bcrypt установите argon2-cffi/bcrypt и поднимите их в начало.
+PASSWORD_HASHERS = [
+    'users.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Не меньше стандартного числа итераций Django (150 000 для 2.2): меньшее
+# значение хешер игнорирует.
+PASSWORD_HASH_ITERATIONS = 150000
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+
+POSTS_ON_PAGE = 10
+
+COMMENTS_ON_PAGE = 20
+
+PAGINATOR_COUNT_TIMEOUT = 60
+
+OBJECT_CACHE_TIMEOUT = 300
+
+OBJECT_CACHE_NEGATIVE_TIMEOUT = 30
+
+VIEW_COUNT_FLUSH_INTERVAL = 5
+
+VIEW_COUNT_FLUSH_SIZE = 1000
+
+GROUP_FEED_CACHED_PAGES = 3
+
+GROUP_FEED_TIMEOUT = 300
+
+GROUP_FEED_HOT_HITS = 10
+
+TRENDING_HALF_LIFE_HOURS = 24
+
+TRENDING_SIZE = 20
+
+TRENDING_POST_WEIGHT = 5
+
+TRENDING_VIEW_WEIGHT = 1
+
+POSTS_ARCHIVE_AFTER_DAYS = 365
+
+POSTS_ARCHIVE_BATCH_SIZE = 1000
+
+# Atom-ленты групп и авторов: число постов и срок жизни документа в кеше.
+FEED_SIZE = 20
+
+FEED_TIMEOUT = 60 * 60 * 24
+
+# Постов в одном файле карты сайта (не больше 50 000 по протоколу).
+SITEMAP_SHARD_SIZE = 10000
+
+SITEMAP_SHARD_TIMEOUT = 60 * 60 * 24
+
+# Лента подписок: сколько постов автора попадает в ленту при подписке.
+TIMELINE_BACKFILL = 100
+
+TIMELINE_BATCH_SIZE = 1000
+
+# Ограничение частоты POST: имя URL → (ключ 'ip' или 'user', частота).
+RATELIMIT_CACHE = 'default'
+
+RATELIMIT_POLICIES = {
+    'posts:post_create': ('user', '10/m'),
+    'posts:post_edit': ('user', '30/m'),
+    'posts:add_comment': ('user', '20/m'),
+    'users:signup': ('ip', '5/h'),
+    'users:login': ('ip', '10/m'),
+    'users:password_reset_form': ('ip', '5/h'),
+}
+
+# Адреса обратных прокси, которым можно верить в X-Forwarded-For.
+RATELIMIT_TRUSTED_PROXIES = []
+
+# manage.py serve. None — воркеров 2 * число ядер + 1.
+SERVE_WORKERS = None
+
+SERVE_THREADS = 2
+
+SERVE_MAX_REQUESTS = 1000
+
+SERVE_MAX_REQUESTS_JITTER = 100
+
+SERVE_MAX_RSS_MB = 300
+
+SERVE_GRACEFUL_TIMEOUT = 30
+
+# Время контекст-процессоров в заголовке Server-Timing.
+CONTEXT_PROCESSOR_PROFILING = False
+
+# Диагностика памяти: tracemalloc, прирост по вьюхам, /debug/memory/.
+MEMORY_PROFILING = False
+
+MEMORY_TRACE_FRAMES = 1
+
+MEMORY_REPORT_INTERVAL = 300
+
+MEMORY_REPORT_TOP = 10
+
+MEMORY_REPORT_MAX_TOP = 100
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.memory': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Очередь писем (core.mail): бэкенд, через который send_outbox отправляет
+# письма, и ограничения отправки.
+EMAIL_OUTBOX_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+EMAIL_OUTBOX_BATCH_SIZE = 50
+
+EMAIL_OUTBOX_RATE = 10
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+EMAIL_OUTBOX_RETRY_DELAY = 60
+
+EMAIL_OUTBOX_POLL_INTERVAL = 5
+
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+
+LOGIN_URL = '/auth/login/'
+
+# Страницы, которые собираются командой build_static_pages при деплое.
+PREBUILT_PAGES = ['about:author', 'about:tech']
+
+PREBUILT_PAGES_DIR = os.path.join(BASE_DIR, 'prebuilt')
@@ -0,0 +1,21 @@
+"""Настройки для разработки и тестов."""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'r32%vizu_ss$6=))o*!b+x#%u-b+hw(s(v*0g^2^9o$p$0z^)p'
+
+DEBUG = True
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
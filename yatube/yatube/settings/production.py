@@ -0,0 +1,120 @@
+"""Настройки рабочего сервера.
+
+Секреты и адреса берутся из окружения:
+
+    YATUBE_SECRET_KEY      обязательна
+    YATUBE_ALLOWED_HOSTS   имена хостов через запятую
+    YATUBE_DB_PATH         файл SQLite (по умолчанию db.sqlite3)
+    YATUBE_MEMCACHED       адреса memcached через запятую; без неё кеш
+                           хранится в файлах YATUBE_CACHE_DIR, общих для
+                           всех воркеров, а ограничение частоты выключено
+    YATUBE_EMAIL_HOST      SMTP-сервер для send_outbox (и YATUBE_EMAIL_PORT)
+    YATUBE_LAZY_URLCONFS   1 — подключать admin/, about/ и сброс пароля
+                           при первом обращении (LAZY_URLCONFS)
+    YATUBE_TRUSTED_PROXIES адреса обратных прокси через запятую (по
+                           умолчанию 127.0.0.1, как у `manage.py serve`)
+
+Проверить настройки: `YATUBE_PROFILE=production manage.py check --deploy`.
+"""
+import copy
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, MIDDLEWARE, TEMPLATES
+
+
+def env_list(name, default=''):
+    return [item for item in os.environ.get(name, default).split(',') if item]
+
+
+SECRET_KEY = os.environ['YATUBE_SECRET_KEY']
+
+DEBUG = False
+
+ALLOWED_HOSTS = env_list('YATUBE_ALLOWED_HOSTS', 'localhost')
+
+# Соединение с базой живёт между запросами, а не открывается на каждый.
+DATABASES = copy.deepcopy(DATABASES)
+DATABASES['default']['NAME'] = os.environ.get(
+    'YATUBE_DB_PATH', DATABASES['default']['NAME']
+)
+DATABASES['default']['CONN_MAX_AGE'] = int(
+    os.environ.get('YATUBE_CONN_MAX_AGE', 600)
+)
+
+# Кеш общий для всех воркеров `manage.py serve`: иначе сброс кеша после
+# записи в одном процессе не доходит до остальных.
+if os.environ.get('YATUBE_MEMCACHED'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': env_list('YATUBE_MEMCACHED'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get(
+                'YATUBE_CACHE_DIR', os.path.join(BASE_DIR, 'cache')
+            ),
+        }
+    }
+
+    # Без общего кеша с атомарным incr счётчики врут, и ограничение
+    # частоты выключено.
+    RATELIMIT_POLICIES = {}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# `manage.py serve` слушает 127.0.0.1 за обратным прокси: без этого все
+# клиенты попали бы в один счётчик ограничения частоты.
+RATELIMIT_TRUSTED_PROXIES = env_list('YATUBE_TRUSTED_PROXIES', '127.0.0.1')
+
+# Шаблоны компилируются один раз на процесс.
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+# Процессор debug при DEBUG=False ничего не добавляет, но вызывается на
+# каждом рендере.
+TEMPLATES[0]['OPTIONS']['context_processors'] = [
+    processor
+    for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+    if processor != 'django.template.context_processors.debug'
+]
+
+MIDDLEWARE = [
+    MIDDLEWARE[0],
+    'django.middleware.gzip.GZipMiddleware',
+    *MIDDLEWARE[1:],
+]
+
+STATIC_ROOT = os.environ.get(
+    'YATUBE_STATIC_ROOT', os.path.join(BASE_DIR, 'collected_static')
+)
+
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
+
+SESSION_COOKIE_SECURE = True
+
+CSRF_COOKIE_SECURE = True
+
+SECURE_CONTENT_TYPE_NOSNIFF = True
+
+SECURE_BROWSER_XSS_FILTER = True
+
+X_FRAME_OPTIONS = 'DENY'
+
+# Письма ставятся в очередь и отправляются командой send_outbox.
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+
+EMAIL_HOST = os.environ.get('YATUBE_EMAIL_HOST', 'localhost')
+
+EMAIL_PORT = int(os.environ.get('YATUBE_EMAIL_PORT', 25))
@@ -0,0 +1,27 @@
+"""Настройки для запуска с постами, разнесёнными по трём SQLite-файлам.
+
+    python manage.py migrate --settings=yatube.settings.shards --database=...
+    python manage.py test posts.tests.test_sharding \
+        --settings=yatube.settings.shards
+
+Остальные тесты написаны для одной базы (счётчики запросов, `databases`
+по умолчанию) и запускаются с обычными настройками.
+"""
+import os
+
+from .development import *  # noqa: F401,F403
+from .development import BASE_DIR, DATABASES
+
+DATABASES = {
+    **DATABASES,
+    'shard_1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'shard_1.sqlite3'),
+    },
+    'shard_2': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'shard_2.sqlite3'),
+    },
+}
+
+POST_SHARDS = ['default', 'shard_1', 'shard_2']
@@ -13,13 +13,37 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
+
+def lazy_include(module, namespace=None):
+    """Как include(), но модуль URL импортируется при первом запросе.
+
+    URLResolver сам импортирует модуль, если получает его имя строкой.
+    """
+    return (module, namespace, namespace)
+
+
+if settings.LAZY_URLCONFS:
+    admin_urls = lazy_include('yatube.admin_urls', namespace='admin')
+    about_urls = lazy_include('about.urls', namespace='about')
+    auth_urls = lazy_include('django.contrib.auth.urls')
+else:
+    admin_urls = admin.site.urls
+    about_urls = include('about.urls', namespace='about')
+    auth_urls = include('django.contrib.auth.urls')
+
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
-    path('admin/', admin.site.urls),
+    path('admin/', admin_urls),
     path('auth/', include('users.urls')),
-    path('auth/', include('django.contrib.auth.urls')),
-    path('about/', include('about.urls', namespace='about')),
+    path('auth/', auth_urls),
+    path('about/', about_urls),
 ]
+
+if settings.MEMORY_PROFILING:
+    from core.views import memory_report
+
+    urlpatterns.append(path('debug/memory/', memory_report))